@@ -51,16 +51,7 @@ async def rate_limit_exceeded_handler(request, exc):
     )
 
 # Configure CORS with restricted methods and headers for production security
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
-cors_origins = [origin.strip() for origin in cors_origins]  # Remove whitespace
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=False,  # Only needed if using auth cookies
-    allow_methods=["GET"],  # Only allow GET for read-only endpoints
-    allow_headers=["Content-Type", "Accept"],  # Whitelist specific headers
-)
+app.add_middleware(CORSMiddleware, **Config.get_cors_settings())
 
 # Initialize database
 db_manager = DatabaseManager()
@@ -18,7 +18,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-import pickle
+import lightgbm as lgb
 import pandas as pd
 import numpy as np
 from loguru import logger
@@ -45,10 +45,9 @@ def setup_logging():
 
 
 def load_model(model_path):
-    """Load trained model from pickle file."""
+    """Load trained LightGBM model from its native text file."""
     try:
-        with open(model_path, 'rb') as f:
-            return pickle.load(f)
+        return lgb.Booster(model_file=model_path)
     except Exception as e:
         logger.error(f"Failed to load model from {model_path}: {e}")
         return None
@@ -208,7 +207,7 @@ def main():
     try:
         # Load model
         logger.info("Loading trained model...")
-        model = load_model("models/lightgbm_model.pkl")
+        model = load_model("models/lightgbm_model.txt")
         if model is None:
             logger.error("Failed to load model. Make sure to train first: python scripts/train_models.py")
             sys.exit(1)
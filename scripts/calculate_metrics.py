@@ -5,8 +5,10 @@ Populates team_game_stats table for all games from 2019-2025.
 
 Usage:
     python calculate_metrics.py
+    python calculate_metrics.py --sql   # compute aggregates with SQL window functions
 """
 
+import argparse
 import sys
 import os
 from datetime import datetime
@@ -37,7 +39,7 @@ def setup_logging():
     )
 
 
-def calculate_metrics():
+def calculate_metrics(use_sql: bool = False):
     """Calculate metrics for all games."""
     logger.info("=" * 80)
     logger.info("NBA Metrics Calculator - Walk-Forward Methodology")
@@ -63,7 +65,10 @@ def calculate_metrics():
         logger.info("CALCULATING METRICS")
         logger.info("=" * 80)
 
-        calculator.calculate_all_metrics()
+        if use_sql:
+            calculator.calculate_all_metrics_sql()
+        else:
+            calculator.calculate_all_metrics()
 
         logger.info("\n" + "=" * 80)
         logger.info("Metrics calculation completed successfully!")
@@ -87,6 +92,14 @@ def calculate_metrics():
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Calculate walk-forward team metrics")
+    parser.add_argument(
+        "--sql",
+        action="store_true",
+        help="Compute aggregates in the database with window functions (ELO still runs in Python)",
+    )
+    args = parser.parse_args()
+
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
 
@@ -94,7 +107,7 @@ def main():
     setup_logging()
 
     # Calculate metrics
-    calculate_metrics()
+    calculate_metrics(use_sql=args.sql)
 
 
 if __name__ == "__main__":
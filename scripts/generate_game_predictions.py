@@ -23,6 +23,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import pickle
+import lightgbm as lgb
 import pandas as pd
 import numpy as np
 from loguru import logger
@@ -88,8 +89,7 @@ def get_pre_game_elo(session: Session, team_id: int, game: Game) -> float:
 def load_lightgbm_model(model_path):
     """Load trained LightGBM model."""
     try:
-        with open(model_path, 'rb') as f:
-            return pickle.load(f)
+        return lgb.Booster(model_file=model_path)
     except Exception as e:
         logger.error(f"Failed to load LightGBM model: {e}")
         return None
@@ -359,7 +359,7 @@ def main():
     try:
         # Load models and data
         logger.info("Loading trained LightGBM model...")
-        lightgbm_model = load_lightgbm_model("models/lightgbm_model.pkl")
+        lightgbm_model = load_lightgbm_model("models/lightgbm_model.txt")
         if lightgbm_model is None:
             logger.error("Failed to load LightGBM model. Run: python scripts/train_models.py")
             sys.exit(1)
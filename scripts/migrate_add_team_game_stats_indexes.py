@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Migration script to add the covering indexes on team_game_stats used by
+pre-game ELO lookups and home/away feature extraction, and drop the
+(team_id, game_id) index that idx_team_game_stats_lookup now covers.
+"""
+
+import sys
+import os
+
+# Load environment variables from .env file
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sqlalchemy import text
+from nba_2x2x2.data import DatabaseManager
+from nba_2x2x2.data.models import TeamGameStats
+
+NEW_INDEXES = ("idx_team_game_stats_lookup", "idx_tgs_game_home")
+# Prefix of idx_team_game_stats_lookup, so it only costs writes
+REDUNDANT_INDEXES = ("idx_team_game_date",)
+
+
+def migrate():
+    """Create the new team_game_stats indexes and drop the redundant ones."""
+    db = DatabaseManager()
+    db.connect()
+
+    try:
+        with db.engine.begin() as connection:
+            for index in TeamGameStats.__table__.indexes:
+                if index.name in NEW_INDEXES:
+                    print(f"Creating index {index.name} (if missing)...")
+                    index.create(connection, checkfirst=True)
+
+            for index_name in REDUNDANT_INDEXES:
+                print(f"Dropping redundant index {index_name} (if present)...")
+                connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+            print("Migration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        raise
+
+    finally:
+        db.disconnect()
+
+if __name__ == "__main__":
+    migrate()
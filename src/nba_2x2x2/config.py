@@ -27,6 +27,8 @@ class Config:
     DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
     DB_SSL_MODE: str = os.getenv("DB_SSL_MODE", "disable")
     DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Seconds before a connection is replaced
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
 
     # ===== EXTERNAL API CONFIGURATION =====
     BALLDONTLIE_API_KEY: str = os.getenv("BALLDONTLIE_API_KEY", "")
@@ -52,6 +54,11 @@ class Config:
     LIGHTGBM_BAGGING_FREQ: int = int(os.getenv("LIGHTGBM_BAGGING_FREQ", "5"))
     LIGHTGBM_NUM_BOOST_ROUND: int = int(os.getenv("LIGHTGBM_NUM_BOOST_ROUND", "500"))
     LIGHTGBM_EARLY_STOPPING_ROUNDS: int = int(os.getenv("LIGHTGBM_EARLY_STOPPING_ROUNDS", "50"))
+    # GPU histogram training (OpenCL build of LightGBM required; falls back to CPU otherwise)
+    LIGHTGBM_USE_GPU: bool = os.getenv("LIGHTGBM_USE_GPU", "false").lower() in ("1", "true", "yes")
+    LIGHTGBM_GPU_PLATFORM_ID: int = int(os.getenv("LIGHTGBM_GPU_PLATFORM_ID", "0"))
+    LIGHTGBM_GPU_DEVICE_ID: int = int(os.getenv("LIGHTGBM_GPU_DEVICE_ID", "0"))
+    LIGHTGBM_GPU_MAX_BIN: int = int(os.getenv("LIGHTGBM_GPU_MAX_BIN", "63"))  # GPU is fastest with small bins
 
     # ===== ELO CONFIGURATION =====
     ELO_K_FACTOR: float = float(os.getenv("ELO_K_FACTOR", "32"))
@@ -74,6 +81,8 @@ class Config:
             errors.append("DB_POOL_SIZE must be >= 1")
         if cls.DB_MAX_OVERFLOW < 0:
             errors.append("DB_MAX_OVERFLOW must be >= 0")
+        if cls.DB_POOL_TIMEOUT <= 0:
+            errors.append("DB_POOL_TIMEOUT must be > 0")
 
         # Validate API rate limiting
         if cls.API_RATE_LIMIT_DELAY <= 0:
@@ -118,7 +127,7 @@ class Config:
     @classmethod
     def get_lightgbm_params(cls) -> dict:
         """Get LightGBM training parameters as dictionary."""
-        return {
+        params = {
             "objective": "binary",
             "metric": "binary_logloss",
             "boosting_type": "gbdt",
@@ -131,6 +140,29 @@ class Config:
             "bagging_freq": cls.LIGHTGBM_BAGGING_FREQ,
             "verbose": -1,
         }
+        if cls.LIGHTGBM_USE_GPU:
+            params.update(cls.get_lightgbm_gpu_params())
+        return params
+
+    @classmethod
+    def get_lightgbm_gpu_params(cls) -> dict:
+        """Get the LightGBM parameters that move histogram construction to the GPU."""
+        return {
+            "device_type": "gpu",
+            "gpu_platform_id": cls.LIGHTGBM_GPU_PLATFORM_ID,
+            "gpu_device_id": cls.LIGHTGBM_GPU_DEVICE_ID,
+            "max_bin": cls.LIGHTGBM_GPU_MAX_BIN,
+        }
+
+    @classmethod
+    def get_cors_settings(cls) -> dict:
+        """Get CORSMiddleware options: configured origins, read-only methods and headers."""
+        return {
+            "allow_origins": cls.CORS_ORIGINS,
+            "allow_credentials": False,  # Only needed if using auth cookies
+            "allow_methods": ["GET"],  # Only allow GET for read-only endpoints
+            "allow_headers": ["Content-Type", "Accept"],  # Whitelist specific headers
+        }
 
     @classmethod
     def to_dict(cls) -> dict:
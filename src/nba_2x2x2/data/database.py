@@ -64,11 +64,20 @@ class DatabaseManager:
                 poolclass=QueuePool,
                 pool_size=Config.DB_POOL_SIZE,
                 max_overflow=Config.DB_MAX_OVERFLOW,
+                pool_timeout=Config.DB_POOL_TIMEOUT,
+                # Recycle before server/NAT idle timeouts and test connections on
+                # checkout so long-running jobs don't fail on a stale socket
+                pool_recycle=Config.DB_POOL_RECYCLE,
+                pool_pre_ping=True,
+                # Reuse the most recently returned connection so idle ones can expire
+                pool_use_lifo=True,
                 echo=False,
                 connect_args=connect_args,
             )
 
-            self.session_factory = sessionmaker(bind=self.engine)
+            # Keep loaded attributes after commit; batch jobs commit often and
+            # would otherwise re-SELECT every object they touch afterwards
+            self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
 
             # Test connection
             with self.engine.connect() as conn:
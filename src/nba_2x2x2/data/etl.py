@@ -3,8 +3,10 @@ ETL (Extract, Transform, Load) module for NBA data.
 Handles data validation, transformation, and database loading.
 """
 
-from typing import List, Optional, Tuple
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from loguru import logger
 
@@ -122,61 +124,68 @@ class NBADataETL:
 
         logger.info(f"Fetching games for {len(seasons)} seasons: {seasons}")
 
-        for season in seasons:
+        for season, season_fetch in self._prefetch_season_games(seasons):
             logger.info(f"Fetching season {season}...")
 
             try:
-                season_games = self.api_client.get_season_games(season)
+                season_games = season_fetch.result()
                 logger.info(f"Season {season}: {len(season_games)} games from API")
 
-                for api_game in season_games:
-                    # Check if game already exists
-                    home_team_id = api_game["home_team"]["id"]
-                    away_team_id = api_game["visitor_team"]["id"]
-                    game_date = api_game["date"].split("T")[0]  # Extract date part
-
-                    existing_game = self.session.query(Game).filter(
-                        Game.home_team_id == home_team_id,
-                        Game.away_team_id == away_team_id,
-                        Game.game_date == game_date,
-                    ).first()
-
-                    # Determine game status: scheduled games (future dates) should not be marked as final
-                    # even if they have projected scores in the API response
-                    today = datetime.now().date()
-                    game_date_obj = datetime.strptime(game_date, "%Y-%m-%d").date()
-
-                    if game_date_obj > today:
-                        status = "scheduled"
-                    else:
-                        status = api_game["status"]  # Use API status for past/today games
-
-                    game_data = {
-                        "id": api_game["id"],
-                        "home_team_id": home_team_id,
-                        "away_team_id": away_team_id,
-                        "home_team_score": api_game["home_team_score"],
-                        "away_team_score": api_game["visitor_team_score"],
-                        "game_date": game_date,
-                        "game_datetime": api_game["date"],
-                        "season": season,
-                        "status": status,
-                        "period": api_game.get("period"),
-                        "time": api_game.get("time"),
-                        "postseason": 1 if api_game.get("postseason", False) else 0,
-                    }
-
-                    if existing_game:
-                        # Update existing game (status, scores might change)
-                        for key, value in game_data.items():
-                            if key != "id":  # Don't update primary key
-                                setattr(existing_game, key, value)
-                        updated_count += 1
-                    else:
-                        # Create new game
-                        game = Game(**game_data)
-                        self.session.add(game)
-                        new_count += 1
+                # Games added in this batch; autoflush is off, so queries won't see them
+                pending_games = {}
+                today = date.today()
+
+                with self.session.no_autoflush:
+                    for api_game in season_games:
+                        # Check if game already exists
+                        home_team_id = api_game["home_team"]["id"]
+                        away_team_id = api_game["visitor_team"]["id"]
+                        # Date part of the ISO timestamp as a real date, so it binds to the DATE column
+                        game_date = date.fromisoformat(api_game["date"][:10])
+
+                        game_key = (home_team_id, away_team_id, game_date)
+                        existing_game = pending_games.get(game_key)
+                        if existing_game is None:
+                            existing_game = self.session.query(Game).filter(
+                                Game.home_team_id == home_team_id,
+                                Game.away_team_id == away_team_id,
+                                Game.game_date == game_date,
+                            ).first()
+
+                        # Determine game status: scheduled games (future dates) should not be marked as final
+                        # even if they have projected scores in the API response
+                        if game_date > today:
+                            status = "scheduled"
+                        else:
+                            status = api_game["status"]  # Use API status for past/today games
+
+                        game_data = {
+                            "id": api_game["id"],
+                            "home_team_id": home_team_id,
+                            "away_team_id": away_team_id,
+                            "home_team_score": api_game["home_team_score"],
+                            "away_team_score": api_game["visitor_team_score"],
+                            "game_date": game_date,
+                            "game_datetime": api_game["date"],
+                            "season": season,
+                            "status": status,
+                            "period": api_game.get("period"),
+                            "time": api_game.get("time"),
+                            "postseason": 1 if api_game.get("postseason", False) else 0,
+                        }
+
+                        if existing_game:
+                            # Update existing game (status, scores might change)
+                            for key, value in game_data.items():
+                                if key != "id":  # Don't update primary key
+                                    setattr(existing_game, key, value)
+                            updated_count += 1
+                        else:
+                            # Create new game
+                            game = Game(**game_data)
+                            self.session.add(game)
+                            pending_games[game_key] = game
+                            new_count += 1
 
                 self.session.commit()
                 logger.info(f"Season {season}: {new_count} new games total")
@@ -191,6 +200,32 @@ class NBADataETL:
         )
         return new_count, updated_count
 
+    def _prefetch_season_games(
+        self, seasons: List[int]
+    ) -> Iterator[Tuple[int, "Future[List[Dict]]"]]:
+        """
+        Yield (season, pending fetch) pairs, one season ahead of the caller.
+
+        The next season is requested from the API on a background thread while
+        the caller writes the current season to the database, so network and
+        database latency overlap instead of adding up. Only one fetch is ever
+        in flight, which keeps the API client's rate limiting intact.
+        """
+        if not seasons:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="season-fetch")
+        try:
+            pending = executor.submit(self.api_client.get_season_games, seasons[0])
+            for idx, season in enumerate(seasons):
+                current = pending
+                if idx + 1 < len(seasons):
+                    # Single worker: the next season starts as soon as this one lands
+                    pending = executor.submit(self.api_client.get_season_games, seasons[idx + 1])
+                yield season, current
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def validate_data(self) -> dict:
         """
         Validate data integrity in database.
@@ -200,16 +235,22 @@ class NBADataETL:
         """
         logger.info("Validating database integrity...")
 
-        results = {
-            "team_count": self.session.query(Team).count(),
-            "game_count": self.session.query(Game).count(),
-            "games_with_scores": self.session.query(Game)
-            .filter(Game.home_team_score.isnot(None))
-            .count(),
-            "games_without_scores": self.session.query(Game)
-            .filter(Game.home_team_score.is_(None))
-            .count(),
-        }
+        # Single round trip: conditional aggregation over games plus a team count subquery
+        row = (
+            self.session.query(
+                select(func.count(Team.id)).scalar_subquery().label("team_count"),
+                func.count(Game.id).label("game_count"),
+                func.count(Game.id)
+                .filter(Game.home_team_score.isnot(None))
+                .label("games_with_scores"),
+                func.count(Game.id)
+                .filter(Game.home_team_score.is_(None))
+                .label("games_without_scores"),
+            )
+            .select_from(Game)
+            .one()
+        )
+        results = dict(row._mapping)
 
         logger.info(f"Validation results: {results}")
         return results
@@ -224,12 +265,18 @@ class NBADataETL:
         Returns:
             Dictionary with season statistics
         """
-        games = self.session.query(Game).filter(Game.season == season).all()
-        completed_games = [g for g in games if g.home_team_score is not None]
+        total_games, completed_games = (
+            self.session.query(
+                func.count(Game.id),
+                func.count(Game.id).filter(Game.home_team_score.isnot(None)),
+            )
+            .filter(Game.season == season)
+            .one()
+        )
 
         return {
             "season": season,
-            "total_games": len(games),
-            "completed_games": len(completed_games),
-            "scheduled_games": len(games) - len(completed_games),
+            "total_games": total_games,
+            "completed_games": completed_games,
+            "scheduled_games": total_games - completed_games,
         }
@@ -4,19 +4,84 @@ Walk-forward methodology: calculates metrics incrementally as games occur.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+    update,
+)
 from loguru import logger
 
 from .models import Game, Team, TeamGameStats
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _elo_pass(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_won: np.ndarray,
+    elo: np.ndarray,
+    k: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Walk ELO ratings forward through games in chronological order.
+
+    Args:
+        home_idx: Index into `elo` of each game's home team
+        away_idx: Index into `elo` of each game's away team
+        home_won: 1 if the home team won each game, 0 otherwise
+        elo: Current rating per team, updated in place
+        k: ELO K-factor
+
+    Returns:
+        Post-game (home, away) ratings for every game
+    """
+    n_games = home_idx.shape[0]
+    post_home = np.empty(n_games)
+    post_away = np.empty(n_games)
+
+    for i in range(n_games):
+        home_elo = elo[home_idx[i]]
+        away_elo = elo[away_idx[i]]
+        expected_home = 1.0 / (1.0 + 10.0 ** ((away_elo - home_elo) / 400.0))
+        expected_away = 1.0 / (1.0 + 10.0 ** ((home_elo - away_elo) / 400.0))
+
+        post_home[i] = home_elo + k * (home_won[i] - expected_home)
+        post_away[i] = away_elo + k * ((1 - home_won[i]) - expected_away)
+
+        elo[home_idx[i]] = post_home[i]
+        elo[away_idx[i]] = post_away[i]
+
+    return post_home, post_away
+
+
+if NUMBA_AVAILABLE:
+    _elo_pass = numba.njit(cache=True)(_elo_pass)
+
 
 class MetricsCalculator:
     """Calculate team metrics using walk-forward methodology."""
 
     ELO_K = 32  # ELO rating adjustment factor
     ELO_INITIAL = 1500.0  # Starting ELO rating
+    ROLLING_WINDOWS = (5, 10, 20, 100)  # Rolling average window sizes (games)
 
     def __init__(self, session: Session):
         """Initialize metrics calculator."""
@@ -36,90 +101,285 @@ class MetricsCalculator:
 
         logger.info(f"Processing {len(games)} games for metrics calculation")
 
+        # ELO depends only on game order and outcomes, so run the whole history
+        # in one pass up front instead of looking up the prior rating per game
+        post_game_elo = self._calculate_elo_history(games)
+
+        # One scan of the existing keys decides insert vs update for every game
+        existing_keys = set(
+            self.session.execute(
+                select(TeamGameStats.game_id, TeamGameStats.team_id)
+            ).tuples()
+        )
+
         for idx, game in enumerate(games):
             if (idx + 1) % 500 == 0:
                 logger.info(f"Processing game {idx + 1}/{len(games)}")
+                self.session.commit()
 
             # Calculate metrics for both teams
-            self._calculate_game_metrics(game)
+            self._calculate_game_metrics(game, post_game_elo[idx], existing_keys)
 
+        self.session.commit()
         logger.info("Metrics calculation completed successfully")
 
-    def _calculate_game_metrics(self, game: Game):
-        """Calculate metrics for both teams in a game."""
-        home_team = game.home_team
-        away_team = game.away_team
+    def calculate_all_metrics_sql(self):
+        """
+        Calculate metrics for all games using SQL window functions.
+
+        Produces the same rows as calculate_all_metrics, but the walk-forward
+        aggregates (record, averages, rolling windows, rest days) are computed
+        inside the database by a single INSERT ... SELECT. Every window ends
+        one row before the current game, so only prior games are used. ELO is
+        path dependent and is applied afterwards from _calculate_elo_history.
+        """
+        logger.info("Starting SQL walk-forward metrics calculation...")
+
+        final = Game.status == "Final"
+
+        # One row per team per game, from that team's perspective
+        team_games = union_all(
+            select(
+                Game.id.label("game_id"),
+                Game.home_team_id.label("team_id"),
+                literal(1).label("is_home"),
+                Game.game_date.label("game_date"),
+                Game.home_team_score.label("pf"),
+                Game.away_team_score.label("pa"),
+            ).where(final),
+            select(
+                Game.id.label("game_id"),
+                Game.away_team_id.label("team_id"),
+                literal(0).label("is_home"),
+                Game.game_date.label("game_date"),
+                Game.away_team_score.label("pf"),
+                Game.home_team_score.label("pa"),
+            ).where(final),
+        ).subquery("team_games")
+
+        tg = team_games.c
+        won = case((tg.pf > tg.pa, 1), else_=0)
+
+        def prior(expr, window=None):
+            """Aggregate over this team's previous `window` games (all if None)."""
+            return expr.over(
+                partition_by=tg.team_id,
+                order_by=(tg.game_date, tg.game_id),
+                rows=(-window if window else None, -1),
+            )
+
+        windowed_columns = [
+            tg.game_id,
+            tg.team_id,
+            tg.is_home,
+            tg.game_date,
+            won.label("game_won"),
+            prior(func.count()).label("games_played"),
+            func.coalesce(prior(func.sum(won)), 0).label("wins"),
+            func.coalesce(prior(func.avg(tg.pf)), 0.0).label("ppf"),
+            func.coalesce(prior(func.avg(tg.pa)), 0.0).label("ppa"),
+            func.lag(tg.game_date, type_=Date)
+            .over(partition_by=tg.team_id, order_by=(tg.game_date, tg.game_id))
+            .label("prev_date"),
+        ]
+        for window in self.ROLLING_WINDOWS:
+            windowed_columns.append(prior(func.avg(tg.pf), window).label(f"ppf_{window}"))
+            windowed_columns.append(prior(func.avg(tg.pa), window).label(f"ppa_{window}"))
+
+        w = select(*windowed_columns).subquery("windowed").c
+        days_rest = self._days_between(w.game_date, w.prev_date)
+
+        stats_columns = {
+            "game_id": w.game_id,
+            "team_id": w.team_id,
+            "is_home": w.is_home,
+            "games_played": w.games_played,
+            "wins": w.wins,
+            "losses": w.games_played - w.wins,
+            "win_pct": case(
+                (w.games_played > 0, cast(w.wins, Float) / cast(w.games_played, Float)),
+                else_=0.0,
+            ),
+            "points_for": w.ppf,
+            "points_against": w.ppa,
+            "point_differential": w.ppf - w.ppa,
+            # Placeholder; the real ratings are written by the ELO pass below
+            "elo_rating": literal(self.ELO_INITIAL),
+            "days_rest": days_rest,
+            "back_to_back": case((days_rest == 1, 1), else_=0),
+            "game_won": w.game_won,
+        }
+        for window in self.ROLLING_WINDOWS:
+            ppf_n, ppa_n = w[f"ppf_{window}"], w[f"ppa_{window}"]
+            stats_columns[f"ppf_{window}game"] = ppf_n
+            stats_columns[f"ppa_{window}game"] = ppa_n
+            stats_columns[f"diff_{window}game"] = ppf_n - ppa_n
+
+        stats_table = TeamGameStats.__table__
+        self.session.execute(
+            delete(stats_table).where(
+                stats_table.c.game_id.in_(select(Game.id).where(final))
+            )
+        )
+        self.session.execute(
+            insert(stats_table).from_select(
+                list(stats_columns), select(*stats_columns.values())
+            )
+        )
+
+        games = (
+            self.session.query(
+                Game.id,
+                Game.home_team_id,
+                Game.away_team_id,
+                Game.home_team_score,
+                Game.away_team_score,
+            )
+            .filter(final)
+            .order_by(Game.game_date, Game.id)
+            .all()
+        )
+        elo_rows = []
+        for game, (home_elo, away_elo) in zip(games, self._calculate_elo_history(games)):
+            elo_rows.append({"b_game_id": game.id, "b_team_id": game.home_team_id, "b_elo": home_elo})
+            elo_rows.append({"b_game_id": game.id, "b_team_id": game.away_team_id, "b_elo": away_elo})
+
+        if elo_rows:
+            self.session.execute(
+                update(stats_table)
+                .where(
+                    (stats_table.c.game_id == bindparam("b_game_id"))
+                    & (stats_table.c.team_id == bindparam("b_team_id"))
+                )
+                .values(elo_rating=bindparam("b_elo")),
+                elo_rows,
+            )
+
+        self.session.commit()
+        logger.info(f"SQL metrics calculation completed for {len(games)} games")
+
+    def _days_between(self, later, earlier):
+        """SQL expression for whole days between two DATE expressions."""
+        if self.session.get_bind().dialect.name == "sqlite":
+            # SQLite stores dates as text; subtract Julian day numbers instead
+            return cast(func.julianday(later) - func.julianday(earlier), Integer)
+        return later - earlier
+
+    def _calculate_elo_history(self, games: List[Game]) -> List[Tuple[float, float]]:
+        """
+        Calculate post-game ELO ratings for chronologically ordered games.
+
+        Returns:
+            (home_post_game_elo, away_post_game_elo) for each game
+        """
+        team_index = {}
+        home_idx = np.empty(len(games), dtype=np.int64)
+        away_idx = np.empty(len(games), dtype=np.int64)
+        home_won = np.empty(len(games), dtype=np.int64)
+
+        for i, game in enumerate(games):
+            home_idx[i] = team_index.setdefault(game.home_team_id, len(team_index))
+            away_idx[i] = team_index.setdefault(game.away_team_id, len(team_index))
+            home_won[i] = 1 if game.home_team_score > game.away_team_score else 0
+
+        elo = np.full(len(team_index), self.ELO_INITIAL)
+        post_home, post_away = _elo_pass(home_idx, away_idx, home_won, elo, float(self.ELO_K))
+
+        return list(zip(post_home.tolist(), post_away.tolist()))
+
+    def _calculate_game_metrics(
+        self,
+        game: Game,
+        post_game_elo: Optional[Tuple[float, float]] = None,
+        existing_keys: Optional[Set[Tuple[int, int]]] = None,
+    ):
+        """
+        Calculate metrics for both teams in a game.
+
+        Rows are written in the current transaction; the caller commits.
+
+        Args:
+            game: Game to calculate metrics for
+            post_game_elo: Precomputed (home, away) post-game ELO; looked up
+                from prior TeamGameStats rows when not provided
+            existing_keys: (game_id, team_id) pairs already in team_game_stats;
+                queried for this game when not provided
+        """
+        home_post_elo, away_post_elo = post_game_elo or (None, None)
+        # FK columns are already loaded; going through game.home_team/away_team
+        # would lazy-load each Team with its own SELECT
+        home_team_id = game.home_team_id
+        away_team_id = game.away_team_id
 
         # Get all games played before this game (for rolling calculations)
-        prev_games_home = self._get_prev_games(home_team.id, game.game_date)
-        prev_games_away = self._get_prev_games(away_team.id, game.game_date)
+        prev_games_home = self._get_prev_games(home_team_id, game.game_date)
+        prev_games_away = self._get_prev_games(away_team_id, game.game_date)
 
         # Determine game outcome
         home_won = game.home_team_score > game.away_team_score
         away_won = not home_won
 
         # Calculate rest days
-        home_rest = self._calculate_rest_days(home_team.id, game.game_date)
-        away_rest = self._calculate_rest_days(away_team.id, game.game_date)
+        home_rest = self._calculate_rest_days(home_team_id, game.game_date)
+        away_rest = self._calculate_rest_days(away_team_id, game.game_date)
 
         # Determine back-to-back status
-        home_b2b = self._is_back_to_back(home_team.id, game.game_date)
-        away_b2b = self._is_back_to_back(away_team.id, game.game_date)
+        home_b2b = self._is_back_to_back(home_team_id, game.game_date)
+        away_b2b = self._is_back_to_back(away_team_id, game.game_date)
 
         # Home team stats (using only pre-game information)
         home_stats = self._calculate_team_stats(
             game_id=game.id,
-            team_id=home_team.id,
+            team_id=home_team_id,
             is_home=1,
             prev_games=prev_games_home,
             game_won=1 if home_won else 0,
             days_rest=home_rest,
             back_to_back=1 if home_b2b else 0,
-            opponent_id=away_team.id,
+            opponent_id=away_team_id,
             game_date=game.game_date,
+            post_game_elo=home_post_elo,
         )
 
         # Away team stats (using only pre-game information)
         away_stats = self._calculate_team_stats(
             game_id=game.id,
-            team_id=away_team.id,
+            team_id=away_team_id,
             is_home=0,
             prev_games=prev_games_away,
             game_won=1 if away_won else 0,
             days_rest=away_rest,
             back_to_back=1 if away_b2b else 0,
-            opponent_id=home_team.id,
+            opponent_id=home_team_id,
             game_date=game.game_date,
+            post_game_elo=away_post_elo,
         )
 
-        # Check if records already exist
-        existing_home = (
-            self.session.query(TeamGameStats)
-            .filter_by(game_id=game.id, team_id=home_team.id)
-            .first()
-        )
-        existing_away = (
-            self.session.query(TeamGameStats)
-            .filter_by(game_id=game.id, team_id=away_team.id)
-            .first()
-        )
-
-        # Create or update records
-        if existing_home:
-            for key, value in home_stats.items():
-                setattr(existing_home, key, value)
-        else:
-            home_stats_obj = TeamGameStats(**home_stats)
-            self.session.add(home_stats_obj)
-
-        if existing_away:
-            for key, value in away_stats.items():
-                setattr(existing_away, key, value)
-        else:
-            away_stats_obj = TeamGameStats(**away_stats)
-            self.session.add(away_stats_obj)
+        if existing_keys is None:
+            existing_keys = set(
+                self.session.execute(
+                    select(TeamGameStats.game_id, TeamGameStats.team_id).where(
+                        TeamGameStats.game_id == game.id
+                    )
+                ).tuples()
+            )
 
-        self.session.commit()
+        # New rows go to a plain Core INSERT; existing ones are rewritten by key
+        # through bulk_upsert (no ORM objects loaded or built just to be flushed)
+        new_rows = []
+        updated_rows = []
+        for stats in (home_stats, away_stats):
+            key = (stats["game_id"], stats["team_id"])
+            if key in existing_keys:
+                updated_rows.append(stats)
+            else:
+                new_rows.append(stats)
+                existing_keys.add(key)
+
+        if updated_rows:
+            TeamGameStats.bulk_upsert(self.session, updated_rows)
+        if new_rows:
+            self.session.execute(insert(TeamGameStats), new_rows)
 
     def _calculate_team_stats(
         self,
@@ -132,6 +392,7 @@ class MetricsCalculator:
         back_to_back: int,
         opponent_id: int,
         game_date,
+        post_game_elo: Optional[float] = None,
     ) -> Dict:
         """
         Calculate all stats for a team in a specific game.
@@ -140,45 +401,46 @@ class MetricsCalculator:
         Current game outcome is stored but NOT used in calculations.
         """
 
-        # Get opponent's ELO rating (pre-game)
-        opponent_elo = self._get_latest_elo(opponent_id, game_date)
-
         # Calculate cumulative stats using ONLY prior games
         games_played = len(prev_games)
         wins = sum(1 for g in prev_games if g["won"])
         losses = games_played - wins
         win_pct = wins / games_played if games_played > 0 else 0.0
 
+        # Prefix sums over prior points: cum[k] = total of the first k prior games
+        pf_cum = np.zeros(games_played + 1)
+        pa_cum = np.zeros(games_played + 1)
+        np.cumsum(np.fromiter((g["pf"] for g in prev_games), float, games_played), out=pf_cum[1:])
+        np.cumsum(np.fromiter((g["pa"] for g in prev_games), float, games_played), out=pa_cum[1:])
+
         # Calculate aggregate points using ONLY prior games
-        total_pf = sum(g["pf"] for g in prev_games)
-        total_pa = sum(g["pa"] for g in prev_games)
-        ppf = total_pf / games_played if games_played > 0 else 0.0
-        ppa = total_pa / games_played if games_played > 0 else 0.0
+        ppf = float(pf_cum[-1]) / games_played if games_played > 0 else 0.0
+        ppa = float(pa_cum[-1]) / games_played if games_played > 0 else 0.0
         point_diff = ppf - ppa
 
         # Calculate rolling averages using ONLY prior games (NO current game)
-        ppf_5 = self._rolling_average([g["pf"] for g in prev_games[-5:]])
-        ppa_5 = self._rolling_average([g["pa"] for g in prev_games[-5:]])
+        ppf_5 = self._window_average(pf_cum, 5)
+        ppa_5 = self._window_average(pa_cum, 5)
         diff_5 = ppf_5 - ppa_5 if ppf_5 is not None and ppa_5 is not None else None
 
-        ppf_10 = self._rolling_average([g["pf"] for g in prev_games[-10:]])
-        ppa_10 = self._rolling_average([g["pa"] for g in prev_games[-10:]])
+        ppf_10 = self._window_average(pf_cum, 10)
+        ppa_10 = self._window_average(pa_cum, 10)
         diff_10 = ppf_10 - ppa_10 if ppf_10 is not None and ppa_10 is not None else None
 
-        ppf_20 = self._rolling_average([g["pf"] for g in prev_games[-20:]])
-        ppa_20 = self._rolling_average([g["pa"] for g in prev_games[-20:]])
+        ppf_20 = self._window_average(pf_cum, 20)
+        ppa_20 = self._window_average(pa_cum, 20)
         diff_20 = ppf_20 - ppa_20 if ppf_20 is not None and ppa_20 is not None else None
 
-        ppf_100 = self._rolling_average([g["pf"] for g in prev_games[-100:]])
-        ppa_100 = self._rolling_average([g["pa"] for g in prev_games[-100:]])
+        ppf_100 = self._window_average(pf_cum, 100)
+        ppa_100 = self._window_average(pa_cum, 100)
         diff_100 = ppf_100 - ppa_100 if ppf_100 is not None and ppa_100 is not None else None
 
-        # Get pre-game ELO rating
-        team_elo = self._get_latest_elo(team_id, game_date)
-
         # Calculate post-game ELO (updated with this game's result)
         # This is what gets stored and retrieved for future games
-        post_game_elo = self._calculate_elo(team_elo, opponent_elo, game_won)
+        if post_game_elo is None:
+            team_elo = self._get_latest_elo(team_id, game_date)
+            opponent_elo = self._get_latest_elo(opponent_id, game_date)
+            post_game_elo = self._calculate_elo(team_elo, opponent_elo, game_won)
 
         return {
             "game_id": game_id,
@@ -211,8 +473,16 @@ class MetricsCalculator:
 
     def _get_prev_games(self, team_id: int, game_date) -> List[Dict]:
         """Get all games played by team before a specific date."""
+        # Only the columns used below: no Game/TeamGameStats objects or identity-map work
         games = (
-            self.session.query(Game, TeamGameStats)
+            self.session.query(
+                Game.id,
+                Game.home_team_id,
+                Game.home_team_score,
+                Game.away_team_score,
+                TeamGameStats.elo_rating,
+            )
+            .select_from(Game)
             .outerjoin(
                 TeamGameStats,
                 (Game.id == TeamGameStats.game_id)
@@ -231,19 +501,19 @@ class MetricsCalculator:
         )
 
         result = []
-        for game, stats in games:
-            is_home = game.home_team_id == team_id
-            pf = game.home_team_score if is_home else game.away_team_score
-            pa = game.away_team_score if is_home else game.home_team_score
+        for game_id, home_team_id, home_score, away_score, elo_rating in games:
+            is_home = home_team_id == team_id
+            pf = home_score if is_home else away_score
+            pa = away_score if is_home else home_score
             won = 1 if pf > pa else 0
 
             result.append(
                 {
-                    "game_id": game.id,
+                    "game_id": game_id,
                     "pf": pf,
                     "pa": pa,
                     "won": won,
-                    "elo": stats.elo_rating if stats else self.ELO_INITIAL,
+                    "elo": elo_rating if elo_rating is not None else self.ELO_INITIAL,
                 }
             )
 
@@ -252,7 +522,7 @@ class MetricsCalculator:
     def _calculate_rest_days(self, team_id: int, game_date) -> int:
         """Calculate days of rest since last game."""
         prev_game = (
-            self.session.query(Game)
+            self.session.query(Game.game_date)
             .filter(
                 ((Game.home_team_id == team_id) | (Game.away_team_id == team_id))
                 & (Game.game_date < game_date)
@@ -271,7 +541,7 @@ class MetricsCalculator:
     def _is_back_to_back(self, team_id: int, game_date) -> bool:
         """Check if team is playing back-to-back games."""
         prev_game = (
-            self.session.query(Game)
+            self.session.query(Game.game_date)
             .filter(
                 ((Game.home_team_id == team_id) | (Game.away_team_id == team_id))
                 & (Game.game_date < game_date)
@@ -290,7 +560,7 @@ class MetricsCalculator:
     def _get_latest_elo(self, team_id: int, game_date) -> float:
         """Get team's ELO rating before a specific game date."""
         latest_stats = (
-            self.session.query(TeamGameStats)
+            self.session.query(TeamGameStats.elo_rating)
             .join(Game, TeamGameStats.game_id == Game.id)
             .filter(
                 (TeamGameStats.team_id == team_id)
@@ -312,8 +582,15 @@ class MetricsCalculator:
         return team_elo + elo_change
 
     @staticmethod
-    def _rolling_average(values: List[float]) -> Optional[float]:
-        """Calculate rolling average from list of values."""
-        if not values:
+    def _window_average(cumsum: np.ndarray, window: int) -> Optional[float]:
+        """
+        Calculate rolling average of the last `window` values.
+
+        Args:
+            cumsum: Zero-prefixed cumulative sum (cumsum[k] = sum of first k values)
+            window: Number of most recent values to average
+        """
+        k = min(window, len(cumsum) - 1)
+        if k == 0:
             return None
-        return sum(values) / len(values)
+        return float(cumsum[-1] - cumsum[-1 - k]) / k
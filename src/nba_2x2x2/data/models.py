@@ -4,6 +4,7 @@ Defines tables for teams, games, and game statistics.
 """
 
 from datetime import datetime
+from typing import Dict, List
 from sqlalchemy import (
     Column,
     Integer,
@@ -15,8 +16,9 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
 Base = declarative_base()
 
@@ -154,12 +156,57 @@ class TeamGameStats(Base):
     # Unique constraint: one entry per team per game
     __table_args__ = (
         UniqueConstraint("game_id", "team_id", name="uq_team_game_stats"),
-        Index("idx_team_game_date", "team_id", "game_id"),
+        # Covers the per-team pre-game ELO lookups without touching the table;
+        # its (team_id, game_id) prefix also serves plain team/game lookups
+        Index("idx_team_game_stats_lookup", "team_id", "game_id", "elo_rating"),
+        # Home/away row lookup by game; Postgres also carries the columns read
+        # most often so feature extraction can use an index-only scan
+        Index(
+            "idx_tgs_game_home",
+            "game_id",
+            "is_home",
+            postgresql_include=["elo_rating", "points_for", "points_against"],
+        ),
     )
 
     def __repr__(self):
         return f"<TeamGameStats Team={self.team_id} Game={self.game_id} ELO={self.elo_rating:.1f}>"
 
+    @classmethod
+    def bulk_upsert(cls, session: Session, rows: List[Dict]):
+        """
+        Insert or update stats rows keyed on (game_id, team_id) in one statement.
+
+        Goes straight to a Core INSERT ... ON CONFLICT DO UPDATE, bypassing the
+        identity map and unit of work. updated_at is stamped once for the
+        whole batch rather than by the per-row onupdate callable.
+        """
+        if not rows:
+            return
+
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            insert_stmt = postgresql.insert
+        elif dialect == "sqlite":
+            insert_stmt = sqlite.insert
+        else:
+            raise NotImplementedError(f"bulk_upsert is not supported on {dialect}")
+
+        now = datetime.utcnow()
+        rows = [dict(row, updated_at=now) for row in rows]
+
+        stmt = insert_stmt(cls.__table__).values(rows)
+        update_columns = {
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name not in ("id", "game_id", "team_id", "created_at")
+        }
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["game_id", "team_id"], set_=update_columns
+            )
+        )
+
 
 class GamePrediction(Base):
     """Model predictions for each game."""
@@ -3,9 +3,10 @@ Feature engineering for game prediction models.
 Extracts features from team_game_stats for home and away teams.
 """
 
-from typing import Tuple, List
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
+from sqlalchemy import Float, cast, func, literal, select
 from sqlalchemy.orm import Session
 from loguru import logger
 
@@ -64,6 +65,47 @@ class FeatureEngineer:
         'diff_20game_diff',
     ]
 
+    # Column position of each feature in the matrix built by build_dataset
+    COL_IDX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+    # TeamGameStats attribute behind each per-team feature (prefixed home_/away_)
+    TEAM_STAT_ATTRS = [
+        ('ppf', 'points_for'),
+        ('ppa', 'points_against'),
+        ('point_diff', 'point_differential'),
+        ('win_pct', 'win_pct'),
+        ('ppf_5game', 'ppf_5game'),
+        ('ppa_5game', 'ppa_5game'),
+        ('diff_5game', 'diff_5game'),
+        ('ppf_10game', 'ppf_10game'),
+        ('ppa_10game', 'ppa_10game'),
+        ('diff_10game', 'diff_10game'),
+        ('ppf_20game', 'ppf_20game'),
+        ('ppa_20game', 'ppa_20game'),
+        ('diff_20game', 'diff_20game'),
+        ('days_rest', 'days_rest'),
+        ('back_to_back', 'back_to_back'),
+    ]
+
+    # Matrix positions of the home_/away_ stat features, in TEAM_STAT_ATTRS order
+    HOME_STAT_COLS = list(map(COL_IDX.get, ['home_' + f for f, _ in TEAM_STAT_ATTRS]))
+    AWAY_STAT_COLS = list(map(COL_IDX.get, ['away_' + f for f, _ in TEAM_STAT_ATTRS]))
+
+    # Interaction features: (name, home feature, away feature)
+    INTERACTIONS = [
+        ('elo_diff', 'home_elo', 'away_elo'),
+        ('ppf_diff', 'home_ppf', 'away_ppf'),
+        ('ppa_diff', 'home_ppa', 'away_ppa'),
+        ('diff_5game_diff', 'home_diff_5game', 'away_diff_5game'),
+        ('diff_10game_diff', 'home_diff_10game', 'away_diff_10game'),
+        ('diff_20game_diff', 'home_diff_20game', 'away_diff_20game'),
+    ]
+
+    # Matrix positions for the interactions: result, home operand, away operand
+    INTERACTION_COLS = list(map(COL_IDX.get, [name for name, _, _ in INTERACTIONS]))
+    INTERACTION_HOME_COLS = list(map(COL_IDX.get, [home for _, home, _ in INTERACTIONS]))
+    INTERACTION_AWAY_COLS = list(map(COL_IDX.get, [away for _, _, away in INTERACTIONS]))
+
     def __init__(self, session: Session):
         """Initialize feature engineer."""
         self.session = session
@@ -91,8 +133,14 @@ class FeatureEngineer:
             return stats.elo_rating
         return self.ELO_INITIAL
 
-    def extract_features(self, game: Game) -> dict:
-        """Extract features for a single game."""
+    def extract_features(self, game: Game, out: np.ndarray) -> bool:
+        """
+        Extract features for a single game into a preallocated buffer.
+
+        Writes one row in FEATURE_COLUMNS order into `out` (missing values as
+        0). Returns False, leaving `out` untouched, if either team has no
+        stats row for the game.
+        """
         home_stats = (
             self.session.query(TeamGameStats)
             .filter_by(game_id=game.id, is_home=1)
@@ -105,121 +153,238 @@ class FeatureEngineer:
         )
 
         if not home_stats or not away_stats:
-            return None
+            return False
 
-        features = {
-            # Home team metrics
-            'home_elo': self._get_pre_game_elo(game.home_team_id, game),
-            'home_ppf': home_stats.points_for,
-            'home_ppa': home_stats.points_against,
-            'home_point_diff': home_stats.point_differential,
-            'home_win_pct': home_stats.win_pct,
-            'home_ppf_5game': home_stats.ppf_5game,
-            'home_ppa_5game': home_stats.ppa_5game,
-            'home_diff_5game': home_stats.diff_5game,
-            'home_ppf_10game': home_stats.ppf_10game,
-            'home_ppa_10game': home_stats.ppa_10game,
-            'home_diff_10game': home_stats.diff_10game,
-            'home_ppf_20game': home_stats.ppf_20game,
-            'home_ppa_20game': home_stats.ppa_20game,
-            'home_diff_20game': home_stats.diff_20game,
-            'home_days_rest': home_stats.days_rest if home_stats.days_rest else 0,
-            'home_back_to_back': home_stats.back_to_back,
-
-            # Away team metrics
-            'away_elo': self._get_pre_game_elo(game.away_team_id, game),
-            'away_ppf': away_stats.points_for,
-            'away_ppa': away_stats.points_against,
-            'away_point_diff': away_stats.point_differential,
-            'away_win_pct': away_stats.win_pct,
-            'away_ppf_5game': away_stats.ppf_5game,
-            'away_ppa_5game': away_stats.ppa_5game,
-            'away_diff_5game': away_stats.diff_5game,
-            'away_ppf_10game': away_stats.ppf_10game,
-            'away_ppa_10game': away_stats.ppa_10game,
-            'away_diff_10game': away_stats.diff_10game,
-            'away_ppf_20game': away_stats.ppf_20game,
-            'away_ppa_20game': away_stats.ppa_20game,
-            'away_diff_20game': away_stats.diff_20game,
-            'away_days_rest': away_stats.days_rest if away_stats.days_rest else 0,
-            'away_back_to_back': away_stats.back_to_back,
-        }
-
-        # Add interaction features
-        features['elo_diff'] = features['home_elo'] - features['away_elo']
-        features['ppf_diff'] = features['home_ppf'] - features['away_ppf']
-        features['ppa_diff'] = features['home_ppa'] - features['away_ppa']
-
-        # Handle None values in rolling averages
-        home_diff_5 = features['home_diff_5game'] if features['home_diff_5game'] is not None else 0
-        away_diff_5 = features['away_diff_5game'] if features['away_diff_5game'] is not None else 0
-        features['diff_5game_diff'] = home_diff_5 - away_diff_5
-
-        home_diff_10 = features['home_diff_10game'] if features['home_diff_10game'] is not None else 0
-        away_diff_10 = features['away_diff_10game'] if features['away_diff_10game'] is not None else 0
-        features['diff_10game_diff'] = home_diff_10 - away_diff_10
-
-        home_diff_20 = features['home_diff_20game'] if features['home_diff_20game'] is not None else 0
-        away_diff_20 = features['away_diff_20game'] if features['away_diff_20game'] is not None else 0
-        features['diff_20game_diff'] = home_diff_20 - away_diff_20
-
-        return features
+        home_elo = self._get_pre_game_elo(game.home_team_id, game)
+        away_elo = self._get_pre_game_elo(game.away_team_id, game)
+
+        self._fill_row(
+            out, self._stat_values(home_stats), self._stat_values(away_stats), home_elo, away_elo
+        )
+        self._finish_features(out[np.newaxis, :])
+        return True
+
+    def extract_features_dict(self, game: Game) -> Optional[dict]:
+        """Extract features for a single game as a {feature name: value} dict."""
+        row = np.empty(len(self.FEATURE_COLUMNS), dtype=np.float64)
+        if not self.extract_features(game, row):
+            return None
+        return dict(zip(self.FEATURE_COLUMNS, row.tolist()))
 
     def build_dataset(self, min_season: int = 2019, max_season: int = 2025) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
         """
         Build complete feature dataset.
 
         Returns:
-            X: DataFrame with features
+            X: float64 DataFrame with features (NaN already filled with 0),
+               wrapping the NumPy feature matrix without a copy
             y: Series with targets (1 if home team won, 0 if away team won)
             dates: List of game dates for time-based splitting
         """
         logger.info(f"Building feature dataset for seasons {min_season}-{max_season}...")
 
+        # Load stats rows and pre-game ELOs for every game up front instead of
+        # issuing ~4 queries per game
+        stats_values, stats_rows_by_game = self._load_stats_by_game(min_season, max_season)
+        pre_game_elos = self._load_pre_game_elos(min_season, max_season)
+
+        # Games are streamed in batches (server-side cursor on PostgreSQL) rather
+        # than materialized with .all(); only games with stats produce a row
         games = (
             self.session.query(Game)
             .filter(Game.status == "Final")
             .filter(Game.season >= min_season)
             .filter(Game.season <= max_season)
             .order_by(Game.game_date)
-            .all()
+            .execution_options(stream_results=True)
+            .yield_per(1000)
         )
 
-        logger.info(f"Processing {len(games)} games...")
+        logger.info(f"Processing games ({len(stats_rows_by_game)} with stats)...")
 
-        X_list = []
-        y_list = []
+        # Rows are written straight into a preallocated matrix (sized by the
+        # games that have stats) rather than built as dicts and inferred by pandas
+        matrix = np.empty((len(stats_rows_by_game), len(self.FEATURE_COLUMNS)), dtype=np.float64)
+        targets = np.empty(len(stats_rows_by_game), dtype=np.int8)
         dates = []
+        n_rows = 0
 
         for idx, game in enumerate(games):
             if (idx + 1) % 1000 == 0:
-                logger.info(f"Processed {idx + 1}/{len(games)} games")
+                logger.info(f"Processed {idx + 1} games")
 
-            features = self.extract_features(game)
-            if features is None:
+            home_row, away_row = stats_rows_by_game.get(game.id, (None, None))
+            if home_row is None or away_row is None:
                 continue
 
-            X_list.append(features)
+            home_elo = pre_game_elos.get((game.home_team_id, game.id))
+            if home_elo is None:
+                home_elo = self._get_pre_game_elo(game.home_team_id, game)
+            away_elo = pre_game_elos.get((game.away_team_id, game.id))
+            if away_elo is None:
+                away_elo = self._get_pre_game_elo(game.away_team_id, game)
+
+            self._fill_row(
+                matrix[n_rows], stats_values[home_row], stats_values[away_row], home_elo, away_elo
+            )
             # Target: 1 if home team won, 0 if away team won
-            y_list.append(1 if game.home_team_score > game.away_team_score else 0)
+            targets[n_rows] = 1 if game.home_team_score > game.away_team_score else 0
             dates.append(pd.Timestamp(game.game_date))
+            n_rows += 1
 
-        logger.info(f"Extracted features for {len(X_list)} games")
-
-        # Create DataFrame
-        X = pd.DataFrame(X_list)
+        logger.info(f"Extracted features for {n_rows} games")
 
-        # Fill NaN values with 0 (from rolling averages that may not have enough games)
-        X = X.fillna(0)
+        matrix = matrix[:n_rows]
+        self._finish_features(matrix)
 
-        y = pd.Series(y_list)
+        X = pd.DataFrame(matrix, columns=self.FEATURE_COLUMNS, copy=False)
+        y = pd.Series(targets[:n_rows])
 
         logger.info(f"Feature matrix shape: {X.shape}")
         logger.info(f"Target distribution: {y.value_counts().to_dict()}")
 
         return X, y, dates
 
+    def _fill_row(
+        self,
+        row: np.ndarray,
+        home_values: np.ndarray,
+        away_values: np.ndarray,
+        home_elo: float,
+        away_elo: float,
+    ):
+        """
+        Write one game's per-team features into a row of the feature matrix.
+
+        home_values/away_values are rows of the stats array from
+        _load_stats_by_game (TEAM_STAT_ATTRS order, NaN for NULL). Interaction
+        columns are filled in by build_dataset once the whole matrix is built.
+        """
+        row[self.COL_IDX['home_elo']] = home_elo
+        row[self.COL_IDX['away_elo']] = away_elo
+        row[self.HOME_STAT_COLS] = home_values
+        row[self.AWAY_STAT_COLS] = away_values
+
+    def _stat_values(self, stats: TeamGameStats) -> np.ndarray:
+        """One team's stat features in TEAM_STAT_ATTRS order, NULL as NaN."""
+        return np.array(
+            [getattr(stats, attr) for _, attr in self.TEAM_STAT_ATTRS], dtype=np.float64
+        )
+
+    def _finish_features(self, matrix: np.ndarray):
+        """
+        Fill NaNs and interaction columns of filled feature rows, in place.
+
+        NaN values become 0 (from rolling averages that may not have enough
+        games); interactions are taken after the fill, so a missing side
+        counts as 0.
+        """
+        np.nan_to_num(matrix, copy=False, nan=0.0)
+        matrix[:, self.INTERACTION_COLS] = (
+            matrix[:, self.INTERACTION_HOME_COLS] - matrix[:, self.INTERACTION_AWAY_COLS]
+        )
+
+    def _load_stats_by_game(
+        self, min_season: int, max_season: int
+    ) -> Tuple[np.ndarray, Dict[int, List[Optional[int]]]]:
+        """
+        Load the feature columns of every stats row in the season range.
+
+        Returns:
+            values: One row per TeamGameStats row, columns in TEAM_STAT_ATTRS
+                order, NULL as NaN
+            rows_by_game: game_id -> [home row index, away row index]
+        """
+        stat_columns = [getattr(TeamGameStats, attr) for _, attr in self.TEAM_STAT_ATTRS]
+        rows = self.session.execute(
+            select(TeamGameStats.game_id, TeamGameStats.is_home, *stat_columns)
+            .join(Game, TeamGameStats.game_id == Game.id)
+            .where(Game.season >= min_season)
+            .where(Game.season <= max_season)
+        ).all()
+
+        # Plain tuples into one float array: no ORM instances or attribute access
+        values = np.array(
+            [row[2:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(stat_columns))
+
+        rows_by_game = {}
+        for idx, row in enumerate(rows):
+            pair = rows_by_game.setdefault(row.game_id, [None, None])
+            slot = 0 if row.is_home == 1 else 1
+            if pair[slot] is None:
+                pair[slot] = idx
+        return values, rows_by_game
+
+    def _load_pre_game_elos(
+        self, min_season: int, max_season: int
+    ) -> Dict[Tuple[int, int], float]:
+        """
+        Map (team_id, game_id) -> the team's ELO before that game.
+
+        Same rule as _get_pre_game_elo, computed for every row in one query:
+        LAG over each team's TeamGameStats rows in (game_date, id) order gives
+        the rating stored on its previous row, or ELO_INITIAL for its first
+        game. The window covers earlier seasons too, so a season's opener
+        picks up the rating carried over from the previous one.
+        """
+        pre_game = (
+            select(
+                TeamGameStats.team_id,
+                TeamGameStats.game_id,
+                Game.season,
+                func.lag(
+                    TeamGameStats.elo_rating, 1, cast(literal(self.ELO_INITIAL), Float)
+                )
+                .over(
+                    partition_by=TeamGameStats.team_id,
+                    order_by=(Game.game_date, Game.id),
+                )
+                .label("pre_game_elo"),
+            )
+            .join(Game, TeamGameStats.game_id == Game.id)
+            .where(Game.season <= max_season)
+            .subquery()
+        )
+        rows = self.session.execute(
+            select(
+                pre_game.c.team_id, pre_game.c.game_id, pre_game.c.pre_game_elo
+            ).where(pre_game.c.season >= min_season)
+        )
+        return {(team_id, game_id): elo for team_id, game_id, elo in rows}
+
     @staticmethod
     def get_feature_columns() -> List[str]:
         """Get list of feature column names."""
         return FeatureEngineer.FEATURE_COLUMNS
+
+
+def _validate_feature_layout() -> None:
+    """
+    Check at import that FEATURE_COLUMNS matches the layout build_dataset writes:
+    home_elo plus the home_ stats, the same for away_, then the interactions,
+    with every interaction operand an existing column. A mismatch would put
+    values under the wrong feature names, so fail before any model sees them.
+    """
+    stat_names = ['elo'] + [feature for feature, _ in FeatureEngineer.TEAM_STAT_ATTRS]
+    expected = (
+        ['home_' + name for name in stat_names]
+        + ['away_' + name for name in stat_names]
+        + [name for name, _, _ in FeatureEngineer.INTERACTIONS]
+    )
+    errors = []
+    if FeatureEngineer.FEATURE_COLUMNS != expected:
+        errors.append(f"FEATURE_COLUMNS must be {expected}, got {FeatureEngineer.FEATURE_COLUMNS}")
+    unknown = [
+        operand
+        for _, home, away in FeatureEngineer.INTERACTIONS
+        for operand in (home, away)
+        if operand not in FeatureEngineer.COL_IDX
+    ]
+    if unknown:
+        errors.append(f"Interaction operands are not feature columns: {unknown}")
+    if errors:
+        raise ValueError("Invalid feature layout:\n" + "\n".join(f"  - {e}" for e in errors))
+
+
+_validate_feature_layout()
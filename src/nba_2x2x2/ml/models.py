@@ -5,7 +5,6 @@ Supports LightGBM and XGBoost with time-based cross-validation.
 
 from typing import Tuple, Dict, List
 from datetime import datetime, timedelta
-import pickle
 import os
 import numpy as np
 import pandas as pd
@@ -63,16 +62,22 @@ class GamePredictor:
         train_cutoff = pd.to_datetime(train_cutoff_date)
         test_cutoff = pd.to_datetime(test_cutoff_date)
 
-        dates_series = pd.Series(dates)
+        dates_index = pd.DatetimeIndex(dates)
 
-        train_mask = dates_series <= train_cutoff
-        test_mask = dates_series >= test_cutoff
+        if dates_index.is_monotonic_increasing:
+            # build_dataset returns games in date order, so each set is a
+            # contiguous slice found by binary search rather than a full mask
+            train_rows = slice(0, dates_index.searchsorted(train_cutoff, side="right"))
+            test_rows = slice(dates_index.searchsorted(test_cutoff, side="left"), None)
+        else:
+            train_rows = np.flatnonzero(dates_index <= train_cutoff)
+            test_rows = np.flatnonzero(dates_index >= test_cutoff)
 
-        X_train = X[train_mask].reset_index(drop=True)
-        y_train = y[train_mask].reset_index(drop=True)
+        X_train = X.iloc[train_rows].reset_index(drop=True)
+        y_train = y.iloc[train_rows].reset_index(drop=True)
 
-        X_test = X[test_mask].reset_index(drop=True)
-        y_test = y[test_mask].reset_index(drop=True)
+        X_test = X.iloc[test_rows].reset_index(drop=True)
+        y_test = y.iloc[test_rows].reset_index(drop=True)
 
         logger.info(f"Train set: {len(X_train)} games (through {train_cutoff_date})")
         logger.info(f"Test set: {len(X_test)} games (from {test_cutoff_date} onwards)")
@@ -101,23 +106,33 @@ class GamePredictor:
         if params:
             default_params.update(params)
 
-        train_data = lgb.Dataset(X_train, label=y_train)
-        valid_data = lgb.Dataset(X_test, label=y_test, reference=train_data)
-
-        self.lgb_model = lgb.train(
-            default_params,
-            train_data,
-            num_boost_round=Config.LIGHTGBM_NUM_BOOST_ROUND,
-            valid_sets=[valid_data],
-            valid_names=["test"],
-            callbacks=[
-                lgb.early_stopping(Config.LIGHTGBM_EARLY_STOPPING_ROUNDS),
-                lgb.log_evaluation(period=0),
-            ],
-        )
+        feature_names = X_train.columns.tolist()
+
+        # Contiguous float32 buffers halve the raw feature memory; LightGBM bins
+        # them on construction and, with free_raw_data, drops its own copy
+        X_train_np = np.ascontiguousarray(X_train.to_numpy(), dtype=np.float32)
+        X_test_np = np.ascontiguousarray(X_test.to_numpy(), dtype=np.float32)
+
+        try:
+            self.lgb_model = self._train_lightgbm_booster(
+                default_params, X_train_np, y_train, X_test_np, y_test, feature_names
+            )
+        except lgb.basic.LightGBMError as e:
+            if default_params.get("device_type") != "gpu":
+                raise
+            # CPU-only LightGBM builds (or hosts without an OpenCL device) reject device_type=gpu
+            logger.warning(f"LightGBM GPU training unavailable ({e}); falling back to CPU")
+            gpu_keys = Config.get_lightgbm_gpu_params()
+            cpu_params = {k: v for k, v in default_params.items() if k not in gpu_keys}
+            self.lgb_model = self._train_lightgbm_booster(
+                cpu_params, X_train_np, y_train, X_test_np, y_test, feature_names
+            )
+
+        # The float32 training copy isn't needed past training
+        del X_train_np
 
         # Get predictions
-        y_pred = self.lgb_model.predict(X_test)
+        y_pred = self.lgb_model.predict(X_test_np)
         y_pred_binary = (y_pred > 0.5).astype(int)
 
         # Evaluate
@@ -137,15 +152,53 @@ class GamePredictor:
         logger.info(f"  Recall: {results['recall']:.4f}")
         logger.info(f"  F1-Score: {results['f1']:.4f}")
 
-        # Save model
-        model_path = os.path.join(self.model_dir, "lightgbm_model.pkl")
-        with open(model_path, "wb") as f:
-            pickle.dump(self.lgb_model, f)
+        # Save model in LightGBM's native text format (best iteration only)
+        model_path = os.path.join(self.model_dir, "lightgbm_model.txt")
+        self.lgb_model.save_model(model_path, num_iteration=self.lgb_model.best_iteration)
         logger.info(f"LightGBM model saved to {model_path}")
 
-        self.feature_names = X_train.columns.tolist()
+        self.feature_names = feature_names
         return results
 
+    def _train_lightgbm_booster(
+        self,
+        params: Dict,
+        X_train_np: np.ndarray,
+        y_train: pd.Series,
+        X_test_np: np.ndarray,
+        y_test: pd.Series,
+        feature_names: List[str],
+    ):
+        """Build the LightGBM datasets and run boosting with early stopping."""
+        dataset_params = {"feature_pre_filter": False}
+
+        train_data = lgb.Dataset(
+            X_train_np,
+            label=np.asarray(y_train, dtype=np.float32),
+            feature_name=feature_names,
+            params=dataset_params,
+            free_raw_data=True,
+        )
+        valid_data = lgb.Dataset(
+            X_test_np,
+            label=np.asarray(y_test, dtype=np.float32),
+            reference=train_data,
+            params=dataset_params,
+            free_raw_data=True,
+        )
+
+        return lgb.train(
+            params,
+            train_data,
+            num_boost_round=Config.LIGHTGBM_NUM_BOOST_ROUND,
+            valid_sets=[valid_data],
+            valid_names=["test"],
+            callbacks=[
+                lgb.early_stopping(Config.LIGHTGBM_EARLY_STOPPING_ROUNDS),
+                lgb.log_evaluation(period=0),
+            ],
+        )
+
     def train_xgboost(
         self,
         X_train: pd.DataFrame,
@@ -175,8 +228,14 @@ class GamePredictor:
         if params:
             default_params.update(params)
 
-        dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=X_train.columns.tolist())
-        dtest = xgb.DMatrix(X_test, label=y_test, feature_names=X_test.columns.tolist())
+        feature_names = X_train.columns.tolist()
+
+        # Dense float32 buffers go straight into the DMatrix without a pandas
+        # conversion pass; both sets share the one feature-name list
+        X_train_np = np.ascontiguousarray(X_train.to_numpy(), dtype=np.float32)
+        X_test_np = np.ascontiguousarray(X_test.to_numpy(), dtype=np.float32)
+        dtrain = xgb.DMatrix(X_train_np, label=y_train, feature_names=feature_names)
+        dtest = xgb.DMatrix(X_test_np, label=y_test, feature_names=feature_names)
 
         evals = [(dtrain, "train"), (dtest, "test")]
         evals_result = {}
@@ -212,13 +271,12 @@ class GamePredictor:
         logger.info(f"  Recall: {results['recall']:.4f}")
         logger.info(f"  F1-Score: {results['f1']:.4f}")
 
-        # Save model
-        model_path = os.path.join(self.model_dir, "xgboost_model.pkl")
-        with open(model_path, "wb") as f:
-            pickle.dump(self.xgb_model, f)
+        # Save model in XGBoost's native JSON format
+        model_path = os.path.join(self.model_dir, "xgboost_model.json")
+        self.xgb_model.save_model(model_path)
         logger.info(f"XGBoost model saved to {model_path}")
 
-        self.feature_names = X_train.columns.tolist()
+        self.feature_names = feature_names
         return results
 
     def get_feature_importance(self, model_type: str = "lightgbm", top_n: int = 20) -> pd.DataFrame:
@@ -241,20 +299,20 @@ class GamePredictor:
 
     def load_lightgbm_model(self):
         """Load LightGBM model from disk."""
-        model_path = os.path.join(self.model_dir, "lightgbm_model.pkl")
+        model_path = os.path.join(self.model_dir, "lightgbm_model.txt")
         if os.path.exists(model_path):
-            with open(model_path, "rb") as f:
-                self.lgb_model = pickle.load(f)
+            self.lgb_model = lgb.Booster(model_file=model_path)
+            self.feature_names = self.lgb_model.feature_name()
             logger.info(f"Loaded LightGBM model from {model_path}")
         else:
             logger.error(f"Model not found at {model_path}")
 
     def load_xgboost_model(self):
         """Load XGBoost model from disk."""
-        model_path = os.path.join(self.model_dir, "xgboost_model.pkl")
+        model_path = os.path.join(self.model_dir, "xgboost_model.json")
         if os.path.exists(model_path):
-            with open(model_path, "rb") as f:
-                self.xgb_model = pickle.load(f)
+            self.xgb_model = xgb.Booster(model_file=model_path)
+            self.feature_names = self.xgb_model.feature_names
             logger.info(f"Loaded XGBoost model from {model_path}")
         else:
             logger.error(f"Model not found at {model_path}")
@@ -266,8 +324,30 @@ class GamePredictor:
         if model_type == "lightgbm" and self.lgb_model:
             return self.lgb_model.predict(X)
         elif model_type == "xgboost" and self.xgb_model:
-            dmatrix = xgb.DMatrix(X, feature_names=self.feature_names)
-            return self.xgb_model.predict(dmatrix)
+            # Score dense input directly; no DMatrix is built per call
+            if isinstance(X, pd.DataFrame):
+                X = X.to_numpy(dtype=np.float32, copy=False)
+            return self.xgb_model.inplace_predict(np.ascontiguousarray(X, dtype=np.float32))
         else:
             logger.error(f"Model {model_type} not loaded")
             return None
+
+    def predict_many(
+        self, X_batches: List[pd.DataFrame], model_type: str = "lightgbm"
+    ) -> List[np.ndarray]:
+        """
+        Generate predictions for several feature frames with one model call.
+
+        The frames are stacked, scored together and the predictions split
+        back out in the same order.
+        """
+        if not X_batches:
+            return []
+
+        stacked = pd.concat(X_batches, ignore_index=True)
+        predictions = self.predict(stacked, model_type=model_type)
+        if predictions is None:
+            return None
+
+        boundaries = np.cumsum([len(X) for X in X_batches])[:-1]
+        return np.split(predictions, boundaries)
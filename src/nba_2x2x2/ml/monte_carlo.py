@@ -6,10 +6,17 @@ with dynamic team rating updates after each simulated game to capture
 team momentum, path dependence, and realistic season dynamics.
 """
 
-import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 @dataclass
 class SimulatedGame:
@@ -23,10 +30,10 @@ class SimulatedGame:
 class SimulationResult:
     """Results from Monte Carlo simulation."""
     mean_wins: float
-    median_wins: float
+    median_wins: int
     std_dev: float
-    percentile_10: float
-    percentile_90: float
+    percentile_10: int
+    percentile_90: int
     distribution: List[int]  # Raw list of simulated final wins for analysis
 
 
@@ -36,6 +43,8 @@ def run_monte_carlo_simulation(
     remaining_games: List[Dict],
     num_simulations: int = 10000,
     team_id: int = None,
+    enable_momentum: bool = True,
+    seed: Optional[int] = None,
 ) -> SimulationResult:
     """
     Run Monte Carlo simulation of remaining season.
@@ -56,98 +65,184 @@ def run_monte_carlo_simulation(
             }
         num_simulations: Number of season simulations to run (default 10,000)
         team_id: Optional team ID for filtering (when simulating specific team)
+        enable_momentum: Apply the hot/cold streak adjustment (default True).
+            Without it every game is an independent draw, simulated in one batch.
+        seed: Seed for the Philox random stream; the same seed gives the same
+            result on any thread count. None draws fresh entropy.
 
     Returns:
         SimulationResult with statistics from all simulations
     """
-    simulated_final_wins = []
+    team_probs = _team_win_probs(remaining_games, team_id)
+
+    # Counter-based generator: simulation i always consumes row i of the draw
+    # matrix, so results depend only on the seed, not on how work is split
+    rng = np.random.Generator(np.random.Philox(seed))
+
+    if not enable_momentum:
+        simulated_final_wins = _simulate_independent(team_probs, current_wins, num_simulations, rng)
+    else:
+        draws = rng.random((num_simulations, len(team_probs)))
+        if NUMBA_AVAILABLE:
+            simulated_final_wins = _simulate_njit(team_probs, draws, current_wins)
+        else:
+            simulated_final_wins = _simulate_vectorized(team_probs, draws, current_wins)
+
+    # Calculate statistics from simulations (population std, nearest-rank
+    # percentiles so median and percentiles stay whole win counts)
+    mean_wins = float(simulated_final_wins.mean())
+    std_dev = float(simulated_final_wins.std())
+    ranks = [int(num_simulations * 0.10), num_simulations // 2, int(num_simulations * 0.90)]
+    percentile_10, median_wins, percentile_90 = (
+        int(w) for w in np.partition(simulated_final_wins, ranks)[ranks]
+    )
+
+    return SimulationResult(
+        mean_wins=mean_wins,
+        median_wins=median_wins,
+        std_dev=std_dev,
+        percentile_10=percentile_10,
+        percentile_90=percentile_90,
+        distribution=simulated_final_wins.tolist(),
+    )
+
+
+def _simulate_independent(
+    team_probs: np.ndarray,
+    current_wins: int,
+    num_simulations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Final win totals for each simulation when games are independent.
+
+    With no momentum there is no path dependence, so the whole
+    (num_simulations, num_games) outcome matrix is one Bernoulli draw.
+    """
+    # Same probability clamp as the momentum paths
+    probs = np.clip(team_probs, 0.05, 0.95)
+    outcomes = rng.binomial(1, probs, size=(num_simulations, len(probs)))
+    return current_wins + outcomes.sum(axis=1, dtype=np.int64)
+
+
+def _simulate_vectorized(
+    team_probs: np.ndarray, draws: np.ndarray, current_wins: int
+) -> np.ndarray:
+    """
+    Final win totals for each simulation, using NumPy.
+
+    All simulations advance together one game at a time: the game loop stays
+    sequential (momentum is path dependent) but each step is a vector op over
+    every simulation instead of num_simulations interpreter iterations. Each
+    simulation's last five results sit in a circular buffer column with a
+    running win count, so the momentum check never re-sums a window.
+
+    draws holds one uniform per (simulation, game).
+    """
+    num_simulations = draws.shape[0]
+    final_wins = np.full(num_simulations, current_wins, dtype=np.int64)
+    recent_results = np.zeros((num_simulations, 5), dtype=np.int8)
+    recent_5_wins = np.zeros(num_simulations, dtype=np.int64)
+
+    for game_idx in range(len(team_probs)):
+        team_win_prob = np.full(num_simulations, team_probs[game_idx])
+
+        # Apply small momentum adjustment based on recent results
+        # If team won 4+ of last 5, slightly boost win prob (+0.02)
+        # If team won 1 or fewer of last 5, slightly reduce win prob (-0.02)
+        if game_idx >= 5:
+            team_win_prob += np.where(
+                recent_5_wins >= 4, 0.02, np.where(recent_5_wins <= 1, -0.02, 0.0)
+            )
+
+        # Apply momentum adjustment (clamped to valid probability range)
+        adjusted_prob = np.clip(team_win_prob, 0.05, 0.95)
+
+        # Simulate game outcome probabilistically
+        game_won = draws[:, game_idx] < adjusted_prob
+        final_wins += game_won
+
+        # Evict the oldest result in each buffer and record this one
+        slot = game_idx % 5
+        recent_5_wins += game_won
+        recent_5_wins -= recent_results[:, slot]
+        recent_results[:, slot] = game_won
+
+    return final_wins
+
+
+def _simulate_njit(
+    team_probs: np.ndarray, draws: np.ndarray, current_wins: int
+) -> np.ndarray:
+    """
+    Final win totals for each simulation, one season per loop iteration.
+
+    Same model and draws as _simulate_vectorized, so both give identical
+    results. Compiled with Numba, seasons run in parallel across threads;
+    the last five results live in a fixed-size circular buffer with a
+    running win count instead of a list.
+    """
+    num_simulations, num_games = draws.shape
+    final_wins = np.empty(num_simulations, dtype=np.int64)
 
-    # Run simulations
-    for sim_num in range(num_simulations):
-        # Reset for this simulation
+    for sim in numba.prange(num_simulations):
         sim_wins = current_wins
-        sim_losses = current_losses
-
-        # Track recent performance for momentum adjustment
-        # Use a 5-game rolling window to detect hot/cold streaks
-        recent_results = []  # Last 5 game outcomes
-
-        # Simulate each remaining game
-        for game_idx, game in enumerate(remaining_games):
-            home_team_id = game['home_team_id']
-            away_team_id = game['away_team_id']
-            blended_prob = game['home_win_prob']
-
-            # Determine if this team is home or away
-            if team_id is not None:
-                if home_team_id == team_id:
-                    # Team is home - use blended probability directly
-                    team_win_prob = blended_prob
-                elif away_team_id == team_id:
-                    # Team is away - use away win probability (1 - home win prob)
-                    team_win_prob = 1.0 - blended_prob
-                else:
-                    # Game doesn't involve this team, skip
-                    continue
-            else:
-                # Simulating all teams - use blended probability directly
-                team_win_prob = blended_prob
-
-            # Apply small momentum adjustment based on recent results
-            # If team won last 3 of 5, slightly boost win prob (up to +0.03)
-            # If team lost last 3 of 5, slightly reduce win prob (down to -0.03)
-            if len(recent_results) >= 5:
-                recent_5_wins = sum(recent_results[-5:])
+        recent_results = np.zeros(5, dtype=np.int8)
+        recent_pos = 0
+        recent_5_wins = 0
+
+        for game_idx in range(num_games):
+            momentum_boost = 0.0
+            if game_idx >= 5:
                 if recent_5_wins >= 4:
-                    # Hot streak: boost probability slightly
                     momentum_boost = 0.02
                 elif recent_5_wins <= 1:
-                    # Cold streak: reduce probability slightly
                     momentum_boost = -0.02
-                else:
-                    momentum_boost = 0.0
-            else:
-                momentum_boost = 0.0
 
-            # Apply momentum adjustment (clamped to valid probability range)
-            adjusted_prob = max(0.05, min(0.95, team_win_prob + momentum_boost))
+            adjusted_prob = min(0.95, max(0.05, team_probs[game_idx] + momentum_boost))
+            game_won = 1 if draws[sim, game_idx] < adjusted_prob else 0
+            sim_wins += game_won
 
-            # Simulate game outcome probabilistically
-            game_won = random.random() < adjusted_prob
+            # Evict the oldest result and record this one
+            recent_5_wins += game_won - recent_results[recent_pos]
+            recent_results[recent_pos] = game_won
+            recent_pos = (recent_pos + 1) % 5
 
-            if game_won:
-                sim_wins += 1
-                recent_results.append(1)
-            else:
-                sim_losses += 1
-                recent_results.append(0)
+        final_wins[sim] = sim_wins
 
-            # Keep only last 5 results
-            if len(recent_results) > 5:
-                recent_results = recent_results[-5:]
+    return final_wins
 
-        simulated_final_wins.append(sim_wins)
 
-    # Calculate statistics from simulations
-    simulated_final_wins.sort()
-    mean_wins = sum(simulated_final_wins) / len(simulated_final_wins)
-    median_wins = simulated_final_wins[len(simulated_final_wins) // 2]
+if NUMBA_AVAILABLE:
+    _simulate_njit = numba.njit(parallel=True, cache=True)(_simulate_njit)
 
-    # Calculate standard deviation
-    variance = sum((w - mean_wins) ** 2 for w in simulated_final_wins) / len(simulated_final_wins)
-    std_dev = variance ** 0.5
 
-    # Calculate percentiles
-    p10_idx = int(len(simulated_final_wins) * 0.10)
-    p90_idx = int(len(simulated_final_wins) * 0.90)
-    percentile_10 = simulated_final_wins[p10_idx]
-    percentile_90 = simulated_final_wins[p90_idx]
+def _team_win_probs(remaining_games: List[Dict], team_id: Optional[int]) -> np.ndarray:
+    """
+    Win probability for the simulated team in each game it plays, in order.
 
-    return SimulationResult(
-        mean_wins=mean_wins,
-        median_wins=median_wins,
-        std_dev=std_dev,
-        percentile_10=percentile_10,
-        percentile_90=percentile_90,
-        distribution=simulated_final_wins,
-    )
+    Games that don't involve team_id are dropped. Without a team_id the
+    home win probability is used for every game.
+    """
+    num_games = len(remaining_games)
+    probs = np.empty(num_games, dtype=np.float64)
+    keep = np.ones(num_games, dtype=bool)
+
+    for i, game in enumerate(remaining_games):
+        blended_prob = game['home_win_prob']
+
+        # Determine if this team is home or away
+        if team_id is None:
+            # Simulating all teams - use blended probability directly
+            probs[i] = blended_prob
+        elif game['home_team_id'] == team_id:
+            # Team is home - use blended probability directly
+            probs[i] = blended_prob
+        elif game['away_team_id'] == team_id:
+            # Team is away - use away win probability (1 - home win prob)
+            probs[i] = 1.0 - blended_prob
+        else:
+            # Game doesn't involve this team, skip
+            keep[i] = False
+
+    return probs[keep]
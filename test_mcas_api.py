@@ -4,17 +4,124 @@ Test script for MCAS Food Assessment API
 Verifies the backend is working correctly
 """
 
-import requests
+import asyncio
+import base64
+import httpx
 import json
+import os
+import sys
 import time
 
+try:
+    import pytest
+except ImportError:  # Running as a plain script; only the pytest cases need it
+    pytest = None
+
 API_URL = 'http://localhost:5000/api'
 
-def test_health():
+# Read-only endpoints whose responses are fixed for a given food database;
+# with --cached their GET responses are reused for CACHE_TTL seconds
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mcas_test_cache.json')
+CACHE_TTL = 300
+CACHED_PATHS = {
+    '/api/database-stats',
+    '/api/search-foods',
+    '/api/foods-by-rating',
+    '/api/foods-by-category',
+}
+# The cache stores decoded bodies, so these no longer describe them
+STALE_BODY_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+# Connects fail fast; reads get long enough for the OpenAI-backed assessments
+TIMEOUT = httpx.Timeout(30, connect=3)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # Seconds; doubles on each retry
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Foods sent to /assess-food; each is checked and reported separately
+ASSESSMENT_FOODS = [
+    "chicken",
+    "tomato",
+    "blue cheese",
+    "fresh salmon",
+]
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Serve repeat GETs to CACHED_PATHS from a JSON file instead of the network"""
+
+    def __init__(self, path=CACHE_FILE, ttl=CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.transport = httpx.AsyncHTTPTransport()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    async def handle_async_request(self, request):
+        if request.method != 'GET' or request.url.path not in CACHED_PATHS:
+            return await self.transport.handle_async_request(request)
+
+        key = str(request.url)
+        entry = self.entries.get(key)
+        if entry and time.time() - entry['time'] < self.ttl:
+            return httpx.Response(
+                entry['status'],
+                # Entries written before these headers were dropped may still carry them
+                headers=[(n, v) for n, v in entry['headers'] if n.lower() not in STALE_BODY_HEADERS],
+                content=base64.b64decode(entry['body']),
+                request=request,
+            )
+
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()  # Already decompressed
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in STALE_BODY_HEADERS
+        ]
+        if response.status_code == 200:
+            self.entries[key] = {
+                'time': time.time(),
+                'status': response.status_code,
+                'headers': headers,
+                'body': base64.b64encode(body).decode('ascii'),
+            }
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f)
+        await self.transport.aclose()
+
+async def _request(client, method, url, **kwargs):
+    """
+    Send one request; returns the response, or the exception raised.
+    Checks await this before printing anything, so their output stays
+    together when several run concurrently.
+
+    Failed connects and RETRY_STATUSES responses are retried with
+    exponential backoff; read timeouts are not, since a slow LLM call
+    would only be slow again.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            if attempt == MAX_RETRIES:
+                return e
+        except Exception as e:
+            return e
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+async def check_health(client):
     """Test if API is running"""
     print("Testing API Health...")
     try:
-        response = requests.get('http://localhost:5000/health', timeout=5)
+        response = await client.get('http://localhost:5000/health', timeout=5)
         if response.status_code == 200:
             print("✓ API is running\n")
             return True
@@ -26,11 +133,13 @@ def test_health():
         print("  Make sure you ran: python mcas_food_api.py\n")
         return False
 
-def test_database_stats():
+async def check_database_stats(client):
     """Test database statistics endpoint"""
+    response = await _request(client, 'GET', f'{API_URL}/database-stats')
     print("Testing Database Stats...")
     try:
-        response = requests.get(f'{API_URL}/database-stats')
+        if isinstance(response, Exception):
+            raise response
         data = response.json()
         print(f"  Total foods: {data['total_foods']}")
         print(f"  Rating 0: {data['by_rating']['0']}")
@@ -43,11 +152,13 @@ def test_database_stats():
         print(f"✗ Error: {e}\n")
         return False
 
-def test_search():
+async def check_search(client):
     """Test food search"""
+    response = await _request(client, 'GET', f'{API_URL}/search-foods?q=chicken')
     print("Testing Food Search...")
     try:
-        response = requests.get(f'{API_URL}/search-foods?q=chicken')
+        if isinstance(response, Exception):
+            raise response
         data = response.json()
         if data['count'] > 0:
             print(f"  Found {data['count']} foods matching 'chicken'")
@@ -61,11 +172,13 @@ def test_search():
         print(f"✗ Error: {e}\n")
         return False
 
-def test_foods_by_rating():
+async def check_foods_by_rating(client):
     """Test filter by rating"""
+    response = await _request(client, 'GET', f'{API_URL}/foods-by-rating?rating=0')
     print("Testing Foods by Rating...")
     try:
-        response = requests.get(f'{API_URL}/foods-by-rating?rating=0')
+        if isinstance(response, Exception):
+            raise response
         data = response.json()
         print(f"  Found {data['count']} Rating 0 foods")
         if data['count'] > 0:
@@ -76,66 +189,67 @@ def test_foods_by_rating():
         print(f"✗ Error: {e}\n")
         return False
 
-def test_food_assessment():
-    """Test food assessment endpoint"""
-    print("Testing Food Assessment (requires OpenAI API key)...")
+async def check_assess_food(client, food_name):
+    """Test the food assessment endpoint for one food"""
+    response = await _request(client, 'POST', f'{API_URL}/assess-food', json={'food_name': food_name})
+    try:
+        print(f"\n  Assessing: {food_name}")
 
-    test_foods = [
-        "chicken",
-        "tomato",
-        "blue cheese",
-        "fresh salmon",
-    ]
+        if isinstance(response, Exception):
+            raise response
 
-    for food_name in test_foods:
-        try:
-            print(f"\n  Assessing: {food_name}")
+        if response.status_code == 200:
+            data = response.json()
 
-            response = requests.post(
-                f'{API_URL}/assess-food',
-                json={'food_name': food_name},
-                timeout=30
-            )
+            # Check for database match
+            if data.get('sighi_exact_match'):
+                rating = data['sighi_exact_match']['rating']
+                print(f"    SIGHI Rating: {rating}")
 
-            if response.status_code == 200:
-                data = response.json()
-
-                # Check for database match
-                if data.get('sighi_exact_match'):
-                    rating = data['sighi_exact_match']['rating']
-                    print(f"    SIGHI Rating: {rating}")
-
-                # Check for LLM assessment
-                if data.get('llm_assessment') and not data['llm_assessment'].get('error'):
-                    assessment = data['llm_assessment']
-                    rating = assessment.get('llm_assessment_rating', '?')
-                    probability = assessment.get('reaction_probability_percentage', '?')
-                    confidence = assessment.get('confidence_percentage', '?')
-                    print(f"    AI Rating: {rating}, Probability: {probability}%, Confidence: {confidence}%")
-                else:
-                    print(f"    AI Assessment: Error or not available")
-                    if data.get('llm_assessment', {}).get('error'):
-                        print(f"    Error: {data['llm_assessment']['error']}")
-
-                print("    ✓ Assessment received")
+            # Check for LLM assessment
+            if data.get('llm_assessment') and not data['llm_assessment'].get('error'):
+                assessment = data['llm_assessment']
+                rating = assessment.get('llm_assessment_rating', '?')
+                probability = assessment.get('reaction_probability_percentage', '?')
+                confidence = assessment.get('confidence_percentage', '?')
+                print(f"    AI Rating: {rating}, Probability: {probability}%, Confidence: {confidence}%")
             else:
-                print(f"    ✗ API error: {response.status_code}")
+                print(f"    AI Assessment: Error or not available")
+                if data.get('llm_assessment', {}).get('error'):
+                    print(f"    Error: {data['llm_assessment']['error']}")
 
-        except requests.exceptions.Timeout:
-            print(f"    ✗ Request timed out (OpenAI API slow)")
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
+            print("    ✓ Assessment received")
+            return True
+        else:
+            print(f"    ✗ API error: {response.status_code}")
+            return False
 
-        time.sleep(1)  # Rate limiting
+    except httpx.TimeoutException:
+        print(f"    ✗ Request timed out (OpenAI API slow)")
+        return False
+    except Exception as e:
+        print(f"    ✗ Error: {e}")
+        return False
+
+async def check_food_assessment(client):
+    """Test food assessment endpoint; returns one (name, passed) result per food"""
+    print("Testing Food Assessment (requires OpenAI API key)...")
+
+    # The assessments are slow LLM-backed calls, so send them all at once
+    outcomes = await asyncio.gather(*(
+        check_assess_food(client, food_name) for food_name in ASSESSMENT_FOODS
+    ))
 
     print("\n✓ Assessment tests completed\n")
-    return True
+    return [(f"Assess: {food_name}", ok) for food_name, ok in zip(ASSESSMENT_FOODS, outcomes)]
 
-def test_categories():
+async def check_categories(client):
     """Test foods by category"""
+    response = await _request(client, 'GET', f'{API_URL}/foods-by-category')
     print("Testing Foods by Category...")
     try:
-        response = requests.get(f'{API_URL}/foods-by-category')
+        if isinstance(response, Exception):
+            raise response
         data = response.json()
         print(f"  Found {len(data)} categories:")
         for category, foods in data.items():
@@ -146,23 +260,35 @@ def test_categories():
         print(f"✗ Error: {e}\n")
         return False
 
+async def run_tests(cached=False):
+    """Run the checks; the independent read-only ones run concurrently"""
+    results = []
+    transport = CachingTransport() if cached else None
+
+    async with httpx.AsyncClient(timeout=TIMEOUT, transport=transport) as client:
+        results.append(("API Health", await check_health(client)))
+
+        if results[-1][1]:  # Only continue if API is running
+            names = ["Database Stats", "Food Search", "Filter by Rating", "Filter by Category"]
+            outcomes = await asyncio.gather(
+                check_database_stats(client),
+                check_search(client),
+                check_foods_by_rating(client),
+                check_categories(client),
+            )
+            results.extend(zip(names, outcomes))
+            results.extend(await check_food_assessment(client))
+
+    return results
+
 def main():
     print("=" * 60)
     print("MCAS FOOD ASSESSMENT API - TEST SUITE")
     print("=" * 60)
     print()
 
-    results = []
-
-    # Run tests
-    results.append(("API Health", test_health()))
-
-    if results[-1][1]:  # Only continue if API is running
-        results.append(("Database Stats", test_database_stats()))
-        results.append(("Food Search", test_search()))
-        results.append(("Filter by Rating", test_foods_by_rating()))
-        results.append(("Filter by Category", test_categories()))
-        results.append(("Food Assessment", test_food_assessment()))
+    # Run tests (--cached reuses recent read-only responses, see CACHED_PATHS)
+    results = asyncio.run(run_tests(cached='--cached' in sys.argv[1:]))
 
     # Summary
     print("=" * 60)
@@ -196,5 +322,27 @@ def main():
 
     print()
 
+# pytest entry point: `pytest test_mcas_api.py` runs one case per assessment food
+if pytest is not None:
+    @pytest.fixture
+    def anyio_backend():
+        return "asyncio"
+
+    @pytest.fixture
+    async def client():
+        """An AsyncClient for the local API; skips the test if the API isn't running"""
+        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+            try:
+                await client.get('http://localhost:5000/health', timeout=5)
+            except httpx.TransportError:
+                pytest.skip("MCAS API not running (start it with: python mcas_food_api.py)")
+            yield client
+
+    # One case per food, so pytest (and pytest-xdist) schedules and reports each separately
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("food_name", ASSESSMENT_FOODS)
+    async def test_assess_food(client, food_name):
+        assert await check_assess_food(client, food_name)
+
 if __name__ == '__main__':
     main()
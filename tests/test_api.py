@@ -3,40 +3,59 @@ Integration tests for FastAPI endpoints.
 Tests API responses, CORS, validation, and end-to-end request flows.
 """
 
+import asyncio
 import pytest
-from datetime import date, datetime, timedelta
-import json
 
+# Acceptable status codes, shared by the assertions below
+OK_OR_MISSING = frozenset({200, 404})  # 404 if there's no data
+OK_OR_UNPROCESSABLE = frozenset({200, 404, 422})
+OK_OR_REJECTED = frozenset({200, 400, 422})
+OK_OR_REDIRECT = frozenset({200, 404, 307})
+WRITE_BLOCKED = frozenset({403, 404, 405})
 
-class TestDailyReportEndpoint:
-    """Test GET /api/report/daily endpoint."""
+
+def assert_status(response, allowed=OK_OR_MISSING):
+    """Assert the response status is one of allowed, showing the body if not."""
+    assert response.status_code in allowed, response.content
+
+
+class TestEndpointsAccessible:
+    """Test that each read-only endpoint responds."""
 
     @pytest.mark.integration
-    def test_daily_report_endpoint_accessible(self, api_client):
-        """Verify daily report endpoint is accessible."""
-        response = api_client.get("/api/report/daily")
-        assert response.status_code in [200, 404]  # May return 404 if no data
+    @pytest.mark.parametrize(
+        "path",
+        ["/api/report/daily", "/api/games", "/api/metrics/summary", "/api/projections/season"],
+    )
+    def test_endpoint_accessible(self, cached_get, path):
+        """Verify the endpoint is accessible."""
+        response = cached_get(path)
+        assert_status(response)  # May return 404 if no data
+
+
+class TestDailyReportEndpoint:
+    """Test GET /api/report/daily endpoint."""
 
     @pytest.mark.integration
-    def test_daily_report_with_valid_date(self, api_client):
+    def test_daily_report_with_valid_date(self, cached_get):
         """Verify daily report accepts valid date format."""
-        response = api_client.get("/api/report/daily?query_date=2025-11-22")
+        response = cached_get("/api/report/daily?query_date=2025-11-22")
         # Should either return 200 OK or 404 (if no data for that date)
-        assert response.status_code in [200, 404, 422]
+        assert_status(response, OK_OR_UNPROCESSABLE)
 
     @pytest.mark.integration
-    def test_daily_report_rejects_invalid_date(self, api_client):
+    def test_daily_report_rejects_invalid_date(self, cached_get):
         """Verify invalid date format returns 400 Bad Request."""
-        response = api_client.get("/api/report/daily?query_date=invalid-date")
+        response = cached_get("/api/report/daily?query_date=invalid-date")
         # Should return 400 Bad Request for invalid format
         assert response.status_code == 400
         # Response should contain error detail
         assert "Invalid date format" in response.json().get("detail", "")
 
     @pytest.mark.integration
-    def test_daily_report_response_format(self, api_client):
+    def test_daily_report_response_format(self, cached_get):
         """Verify daily report response has expected structure."""
-        response = api_client.get("/api/report/daily")
+        response = cached_get("/api/report/daily")
         if response.status_code == 200:
             data = response.json()
             # Should have basic structure
@@ -47,42 +66,36 @@ class TestGamesListEndpoint:
     """Test GET /api/games endpoint."""
 
     @pytest.mark.integration
-    def test_games_list_endpoint_accessible(self, api_client):
-        """Verify games list endpoint is accessible."""
-        response = api_client.get("/api/games")
-        assert response.status_code in [200, 404]
-
-    @pytest.mark.integration
-    def test_games_list_with_limit_parameter(self, api_client):
+    def test_games_list_with_limit_parameter(self, cached_get):
         """Verify limit parameter works."""
-        response = api_client.get("/api/games?limit=5")
-        assert response.status_code in [200, 404]
+        response = cached_get("/api/games?limit=5")
+        assert_status(response)
 
     @pytest.mark.integration
-    def test_games_list_with_offset_parameter(self, api_client):
+    def test_games_list_with_offset_parameter(self, cached_get):
         """Verify offset parameter works for pagination."""
-        response = api_client.get("/api/games?offset=10&limit=5")
-        assert response.status_code in [200, 404]
+        response = cached_get("/api/games?offset=10&limit=5")
+        assert_status(response)
 
     @pytest.mark.integration
-    def test_games_list_with_date_filter(self, api_client):
+    def test_games_list_with_date_filter(self, cached_get):
         """Verify date filtering works."""
-        response = api_client.get("/api/games?from_date=2025-01-01&to_date=2025-11-22")
-        assert response.status_code in [200, 404, 422]
+        response = cached_get("/api/games?from_date=2025-01-01&to_date=2025-11-22")
+        assert_status(response, OK_OR_UNPROCESSABLE)
 
     @pytest.mark.integration
-    def test_games_list_default_pagination(self, api_client):
+    def test_games_list_default_pagination(self, cached_get):
         """Verify games list has sensible defaults."""
-        response = api_client.get("/api/games")
+        response = cached_get("/api/games")
         if response.status_code == 200:
             data = response.json()
             # Should return a list or dict with games
             assert isinstance(data, (list, dict))
 
     @pytest.mark.integration
-    def test_games_list_response_structure(self, api_client):
+    def test_games_list_response_structure(self, cached_get):
         """Verify games list response has expected structure."""
-        response = api_client.get("/api/games?limit=1")
+        response = cached_get("/api/games?limit=1")
         if response.status_code == 200:
             data = response.json()
             # Should be list or dict
@@ -93,23 +106,17 @@ class TestMetricsSummaryEndpoint:
     """Test GET /api/metrics/summary endpoint."""
 
     @pytest.mark.integration
-    def test_metrics_summary_endpoint_accessible(self, api_client):
-        """Verify metrics summary endpoint is accessible."""
-        response = api_client.get("/api/metrics/summary")
-        assert response.status_code in [200, 404]
-
-    @pytest.mark.integration
-    def test_metrics_summary_with_date_range(self, api_client):
+    def test_metrics_summary_with_date_range(self, cached_get):
         """Verify metrics summary accepts date range."""
-        response = api_client.get(
+        response = cached_get(
             "/api/metrics/summary?from_date=2025-01-01&to_date=2025-11-22"
         )
-        assert response.status_code in [200, 404, 422]
+        assert_status(response, OK_OR_UNPROCESSABLE)
 
     @pytest.mark.integration
-    def test_metrics_summary_returns_metrics(self, api_client):
+    def test_metrics_summary_returns_metrics(self, cached_get):
         """Verify metrics summary returns metrics data."""
-        response = api_client.get("/api/metrics/summary")
+        response = cached_get("/api/metrics/summary")
         if response.status_code == 200:
             data = response.json()
             # Should return dict with metrics
@@ -120,15 +127,9 @@ class TestProjectionsEndpoint:
     """Test GET /api/projections/season endpoint."""
 
     @pytest.mark.integration
-    def test_projections_season_endpoint_accessible(self, api_client):
-        """Verify season projections endpoint is accessible."""
-        response = api_client.get("/api/projections/season")
-        assert response.status_code in [200, 404]
-
-    @pytest.mark.integration
-    def test_projections_season_returns_data(self, api_client):
+    def test_projections_season_returns_data(self, cached_get):
         """Verify season projections returns data."""
-        response = api_client.get("/api/projections/season")
+        response = cached_get("/api/projections/season")
         if response.status_code == 200:
             data = response.json()
             assert isinstance(data, (dict, list))
@@ -139,58 +140,48 @@ class TestCORSSecurity:
 
     @pytest.mark.integration
     @pytest.mark.critical
-    def test_cors_allows_get_requests(self, api_client):
+    def test_cors_allows_get_requests(self, cors_only_client):
         """Verify GET requests are allowed by CORS."""
-        response = api_client.get("/api/games")
+        response = cors_only_client.get("/api/games")
         # GET should be allowed
-        assert response.status_code in [200, 404]
-
-    @pytest.mark.integration
-    @pytest.mark.critical
-    def test_cors_blocks_delete_requests(self, api_client):
-        """Verify DELETE requests are blocked by CORS."""
-        response = api_client.delete("/api/games")
-        # DELETE should be blocked or not found
-        assert response.status_code in [405, 403, 404]
+        assert_status(response)
 
     @pytest.mark.integration
-    @pytest.mark.critical
-    def test_cors_blocks_post_requests(self, api_client):
-        """Verify POST requests are blocked by CORS."""
-        response = api_client.post("/api/games", json={})
-        # POST should be blocked
-        assert response.status_code in [405, 403, 404]
-
-    @pytest.mark.integration
-    def test_cors_blocks_patch_requests(self, api_client):
-        """Verify PATCH requests are blocked by CORS."""
-        response = api_client.patch("/api/games", json={})
-        # PATCH should be blocked
-        assert response.status_code in [405, 403, 404]
+    @pytest.mark.parametrize(
+        "method",
+        [
+            pytest.param("delete", marks=pytest.mark.critical),
+            pytest.param("post", marks=pytest.mark.critical),
+            "patch",
+        ],
+    )
+    def test_cors_blocks_write_requests(self, cors_only_client, method):
+        """Verify DELETE/POST/PATCH requests are blocked by CORS."""
+        kwargs = {} if method == "delete" else {"json": {}}
+        response = getattr(cors_only_client, method)("/api/games", **kwargs)
+        # Writes should be blocked or not found
+        assert_status(response, WRITE_BLOCKED)
 
 
 class TestAPIDocumentation:
     """Test API documentation endpoints."""
 
     @pytest.mark.integration
-    def test_swagger_ui_accessible(self, api_client):
+    def test_swagger_ui_accessible(self, cached_get):
         """Verify Swagger UI documentation is accessible."""
-        response = api_client.get("/docs")
+        response = cached_get("/docs")
         assert response.status_code == 200
 
     @pytest.mark.integration
-    def test_openapi_schema_accessible(self, api_client):
+    def test_openapi_schema_accessible(self, openapi_schema):
         """Verify OpenAPI schema is accessible."""
-        response = api_client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert "openapi" in data
-        assert "paths" in data
+        assert "openapi" in openapi_schema
+        assert "paths" in openapi_schema
 
     @pytest.mark.integration
-    def test_redoc_accessible(self, api_client):
+    def test_redoc_accessible(self, cached_get):
         """Verify ReDoc documentation is accessible."""
-        response = api_client.get("/redoc")
+        response = cached_get("/redoc")
         assert response.status_code == 200
 
 
@@ -198,22 +189,22 @@ class TestErrorHandling:
     """Test error handling and responses."""
 
     @pytest.mark.integration
-    def test_invalid_endpoint_returns_404(self, api_client):
+    def test_invalid_endpoint_returns_404(self, cors_only_client):
         """Verify invalid endpoints return 404."""
-        response = api_client.get("/api/nonexistent")
+        response = cors_only_client.get("/api/nonexistent")
         assert response.status_code == 404
 
     @pytest.mark.integration
-    def test_malformed_query_parameters(self, api_client):
+    def test_malformed_query_parameters(self, cached_get):
         """Verify malformed query parameters are handled."""
-        response = api_client.get("/api/games?limit=abc")
+        response = cached_get("/api/games?limit=abc")
         # Should handle gracefully (422 or 400)
-        assert response.status_code in [200, 400, 422]
+        assert_status(response, OK_OR_REJECTED)
 
     @pytest.mark.integration
-    def test_error_response_format(self, api_client):
+    def test_error_response_format(self, cached_get):
         """Verify error responses have proper format."""
-        response = api_client.get("/api/report/daily?query_date=invalid")
+        response = cached_get("/api/report/daily?query_date=invalid")
         if response.status_code >= 400:
             data = response.json()
             # Error response should have detail
@@ -225,36 +216,25 @@ class TestDateValidation:
 
     @pytest.mark.integration
     @pytest.mark.critical
-    def test_valid_date_format_yyyy_mm_dd(self, api_client):
+    def test_valid_date_format_yyyy_mm_dd(self, cached_get):
         """Verify YYYY-MM-DD format is accepted."""
-        response = api_client.get("/api/report/daily?query_date=2025-11-22")
+        response = cached_get("/api/report/daily?query_date=2025-11-22")
         # Should not return 400
         assert response.status_code != 400
 
     @pytest.mark.integration
-    @pytest.mark.critical
-    def test_invalid_date_format_mm_dd_yyyy(self, api_client):
-        """Verify MM-DD-YYYY format is rejected."""
-        response = api_client.get("/api/report/daily?query_date=11-22-2025")
-        assert response.status_code == 400
-
-    @pytest.mark.integration
-    @pytest.mark.critical
-    def test_invalid_date_format_text(self, api_client):
-        """Verify random text is rejected."""
-        response = api_client.get("/api/report/daily?query_date=yesterday")
-        assert response.status_code == 400
-
-    @pytest.mark.integration
-    def test_invalid_month_in_date(self, api_client):
-        """Verify invalid dates (month 13) are rejected."""
-        response = api_client.get("/api/report/daily?query_date=2025-13-01")
-        assert response.status_code == 400
-
-    @pytest.mark.integration
-    def test_invalid_day_in_date(self, api_client):
-        """Verify invalid dates (day 32) are rejected."""
-        response = api_client.get("/api/report/daily?query_date=2025-01-32")
+    @pytest.mark.parametrize(
+        "bad_date",
+        [
+            pytest.param("11-22-2025", marks=pytest.mark.critical, id="mm-dd-yyyy"),
+            pytest.param("yesterday", marks=pytest.mark.critical, id="text"),
+            pytest.param("2025-13-01", id="month-13"),
+            pytest.param("2025-01-32", id="day-32"),
+        ],
+    )
+    def test_invalid_date_rejected(self, cached_get, bad_date):
+        """Verify malformed or impossible dates are rejected."""
+        response = cached_get(f"/api/report/daily?query_date={bad_date}")
         assert response.status_code == 400
 
 
@@ -262,29 +242,26 @@ class TestResponseContentType:
     """Test response content types."""
 
     @pytest.mark.integration
-    def test_json_responses_have_content_type(self, api_client):
+    def test_json_responses_have_content_type(self, cached_get):
         """Verify JSON responses have correct content type."""
-        response = api_client.get("/api/games")
+        response = cached_get("/api/games")
         # Content-Type should be JSON
         assert "application/json" in response.headers.get("content-type", "")
 
     @pytest.mark.integration
-    def test_openapi_schema_is_json(self, api_client):
+    def test_openapi_schema_is_json(self, openapi_schema):
         """Verify OpenAPI schema returns valid JSON."""
-        response = api_client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, dict)
+        assert isinstance(openapi_schema, dict)
 
 
 class TestEndpointParameters:
     """Test endpoint parameter validation."""
 
     @pytest.mark.integration
-    def test_games_limit_parameter_integer(self, api_client):
+    def test_games_limit_parameter_integer(self, cached_get):
         """Verify limit parameter accepts integers."""
-        response = api_client.get("/api/games?limit=10")
-        assert response.status_code in [200, 404, 422]
+        response = cached_get("/api/games?limit=10")
+        assert_status(response, OK_OR_UNPROCESSABLE)
 
     @pytest.mark.integration
     @pytest.mark.skip(reason="Negative limit causes DB error - known limitation")
@@ -295,28 +272,31 @@ class TestEndpointParameters:
         assert response.status_code < 500  # No server error
 
     @pytest.mark.integration
-    def test_games_offset_parameter_works(self, api_client):
+    def test_games_offset_parameter_works(self, cached_get):
         """Verify offset parameter works."""
-        response = api_client.get("/api/games?offset=5")
-        assert response.status_code in [200, 404, 422]
+        response = cached_get("/api/games?offset=5")
+        assert_status(response, OK_OR_UNPROCESSABLE)
 
 
 class TestAPIHealthAndAvailability:
     """Test API health and availability."""
 
     @pytest.mark.integration
-    def test_api_root_accessible(self, api_client):
+    def test_api_root_accessible(self, cached_get):
         """Verify API root is accessible."""
         # Root path may 404 or return docs, both are acceptable
-        response = api_client.get("/")
-        assert response.status_code in [200, 404, 307]  # 307 is redirect
+        response = cached_get("/")
+        assert_status(response, OK_OR_REDIRECT)  # 307 is redirect
 
     @pytest.mark.integration
-    def test_multiple_requests_work(self, api_client):
-        """Verify multiple sequential requests work."""
-        response1 = api_client.get("/api/games")
-        response2 = api_client.get("/api/report/daily")
-        response3 = api_client.get("/api/metrics/summary")
+    @pytest.mark.anyio
+    async def test_multiple_requests_work(self, async_api_client):
+        """Verify multiple concurrent requests work."""
+        response1, response2, response3 = await asyncio.gather(
+            async_api_client.get("/api/games"),
+            async_api_client.get("/api/report/daily"),
+            async_api_client.get("/api/metrics/summary"),
+        )
 
         # All should complete without error
         assert response1.status_code < 500
@@ -328,10 +308,13 @@ class TestResponseConsistency:
     """Test that responses are consistent."""
 
     @pytest.mark.integration
-    def test_same_request_produces_same_response_structure(self, api_client):
+    @pytest.mark.anyio
+    async def test_same_request_produces_same_response_structure(self, async_api_client):
         """Verify same request produces consistent response structure."""
-        response1 = api_client.get("/api/games?limit=5")
-        response2 = api_client.get("/api/games?limit=5")
+        response1, response2 = await asyncio.gather(
+            async_api_client.get("/api/games?limit=5"),
+            async_api_client.get("/api/games?limit=5"),
+        )
 
         if response1.status_code == 200 and response2.status_code == 200:
             data1 = response1.json()
@@ -7,25 +7,96 @@ the outcome of the game being predicted.
 """
 
 import pytest
-import sys
-import os
+import re
+from pathlib import Path
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+# Skip rather than error if the script's heavy dependencies are unavailable
+generate_game_predictions = pytest.importorskip("generate_game_predictions")
+get_elo_win_probability = generate_game_predictions.get_elo_win_probability
+get_pre_game_elo = generate_game_predictions.get_pre_game_elo
+
+# Lakers (home) vs Warriors: both 1500 before the game; Warriors win and
+# move to 1530, Lakers drop to 1470. The probability is a pure function of
+# the two ratings, so each pair is evaluated once here and shared.
+PRE_GAME_PROB = get_elo_win_probability(home_elo=1500.0, away_elo=1500.0)
+POST_GAME_PROB = get_elo_win_probability(home_elo=1470.0, away_elo=1530.0)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Snippets the predictions script must contain (only "leakage" is case-insensitive)
+SCRIPT_REQUIRED = {
+    "def get_pre_game_elo",
+    "get_pre_game_elo(session, game.home_team_id",
+    "get_pre_game_elo(session, game.away_team_id",
+    "leakage",
+}
+SCRIPT_PATTERN = re.compile(
+    r"def get_pre_game_elo"
+    r"|get_pre_game_elo\(session, game\.home_team_id"
+    r"|get_pre_game_elo\(session, game\.away_team_id"
+    r"|(?i:leakage)"
+)
+
+# Snippets the ELO probability section of the script must contain
+ELO_SECTION_REQUIRED = {"pre_game_elo_home", "pre_game_elo_away", "get_elo_win_probability("}
+ELO_SECTION_PATTERN = re.compile(r"pre_game_elo_home|pre_game_elo_away|get_elo_win_probability\(")
+
+
+def find_snippets(pattern: re.Pattern, content: str, *span: int) -> set:
+    """Distinct (lower-cased) matches of pattern in content, in a single scan."""
+    return {match.group().lower() for match in pattern.finditer(content, *span)}
+
+
+def read_source(relative_path: str) -> str:
+    """Read a repo file for source inspection, skipping if it isn't there."""
+    path = REPO_ROOT / relative_path
+    if not path.is_file():
+        pytest.skip(f"{relative_path} not found")
+    return path.read_text()
+
+
+@pytest.fixture(scope="module")
+def predictions_source() -> str:
+    """Source of scripts/generate_game_predictions.py, read once per module."""
+    return read_source("scripts/generate_game_predictions.py")
+
+
+@pytest.fixture(scope="module")
+def metrics_source() -> str:
+    """Source of the metrics module, read once per module."""
+    return read_source("src/nba_2x2x2/data/metrics.py")
+
+
+@pytest.fixture(scope="module")
+def features_source() -> str:
+    """Source of the feature engineering module, read once per module."""
+    return read_source("src/nba_2x2x2/ml/features.py")
 
 
 class TestELOLeakageFixCore:
     """Test core logic of ELO leakage prevention."""
 
+    @pytest.mark.unit
     @pytest.mark.critical
     def test_get_pre_game_elo_function_exists(self):
         """Verify get_pre_game_elo function is implemented."""
-        from generate_game_predictions import get_pre_game_elo
-
         # Function should be callable
         assert callable(get_pre_game_elo)
 
+    @pytest.mark.unit
     @pytest.mark.critical
-    def test_elo_calculation_formula_correct(self):
+    @pytest.mark.parametrize(
+        "home_elo,away_elo,check",
+        [
+            # Equal ELO ratings should be ~0.5
+            pytest.param(1500.0, 1500.0, lambda p: abs(p - 0.5) < 0.001, id="equal"),
+            # Home team has higher win prob
+            pytest.param(1550.0, 1450.0, lambda p: p > 0.5, id="home-higher"),
+            # Home team has lower win prob
+            pytest.param(1450.0, 1550.0, lambda p: p < 0.5, id="away-higher"),
+        ],
+    )
+    def test_elo_calculation_formula_correct(self, home_elo, away_elo, check):
         """
         CRITICAL: Verify ELO probability calculation formula.
 
@@ -33,23 +104,17 @@ class TestELOLeakageFixCore:
 
         This ensures consistent ELO calculations across the system.
         """
-        from generate_game_predictions import get_elo_win_probability
-
-        # Test with equal ELO ratings
-        equal_prob = get_elo_win_probability(1500.0, 1500.0)
-        assert abs(equal_prob - 0.5) < 0.001  # Should be ~0.5
+        assert check(get_elo_win_probability(home_elo, away_elo))
 
-        # Test with home advantage in ELO
+    @pytest.mark.unit
+    @pytest.mark.critical
+    def test_elo_probabilities_complementary(self):
+        """Swapping home and away should give probabilities summing to ~1.0."""
         home_higher = get_elo_win_probability(1550.0, 1450.0)
-        assert home_higher > 0.5  # Home team has higher win prob
-
-        # Test with away advantage in ELO
         away_higher = get_elo_win_probability(1450.0, 1550.0)
-        assert away_higher < 0.5  # Home team has lower win prob
-
-        # Probabilities should be complementary (sum to ~1.0)
         assert abs((home_higher + away_higher) - 1.0) < 0.01  # Roughly sums to 1.0
 
+    @pytest.mark.unit
     @pytest.mark.critical
     def test_elo_leakage_risk_scenario_explained(self):
         """
@@ -69,77 +134,39 @@ class TestELOLeakageFixCore:
         - get_pre_game_elo() retrieves ELO from BEFORE the game
         - Prevents using post-game values for the same game
         """
-        from generate_game_predictions import get_elo_win_probability
-
-        # Simulate the scenario
-        pre_game_warriors = 1500.0
-        pre_game_lakers = 1500.0
-
-        # Pre-game prediction (CORRECT)
-        pre_game_prob = get_elo_win_probability(
-            home_elo=pre_game_lakers,
-            away_elo=pre_game_warriors,
-        )
-
-        # Warriors wins, ELO updates
-        post_game_warriors = 1530.0
-        post_game_lakers = 1470.0
-
-        # Post-game prediction (WRONG if used for same game)
-        post_game_prob = get_elo_win_probability(
-            home_elo=post_game_lakers,
-            away_elo=post_game_warriors,
-        )
-
-        # The difference shows the leakage
-        assert pre_game_prob != post_game_prob
-        assert abs(pre_game_prob - post_game_prob) > 0.05  # Significant difference
+        # Pre-game prediction (CORRECT) vs post-game prediction (WRONG if
+        # used for the same game): the difference shows the leakage
+        assert POST_GAME_PROB != pytest.approx(PRE_GAME_PROB)
+        assert abs(PRE_GAME_PROB - POST_GAME_PROB) > 0.05  # Significant difference
 
         # Post-game probability is LOWER for Lakers (incorporates loss)
-        assert post_game_prob < pre_game_prob
+        assert POST_GAME_PROB < PRE_GAME_PROB
 
-    def test_generated_predictions_script_updated(self):
+    def test_generated_predictions_script_updated(self, predictions_source):
         """Verify that generate_game_predictions.py uses pre-game ELO."""
-        with open(
-            "/Users/michaelstrong/2x2x2-nba-predictive-model/scripts/generate_game_predictions.py",
-            "r",
-        ) as f:
-            content = f.read()
-
-        # Should have get_pre_game_elo function
-        assert "def get_pre_game_elo" in content
-
-        # Should call get_pre_game_elo for both teams
-        assert "get_pre_game_elo(session, game.home_team_id" in content
-        assert "get_pre_game_elo(session, game.away_team_id" in content
-
-        # Should have explanatory comment about preventing leakage
-        assert "prevent data leakage" in content.lower() or "leakage" in content.lower()
+        # Should define get_pre_game_elo, call it for both teams, and
+        # carry an explanatory comment about preventing leakage
+        missing = SCRIPT_REQUIRED - find_snippets(SCRIPT_PATTERN, predictions_source)
+        assert not missing, f"generate_game_predictions.py is missing {sorted(missing)}"
 
-    def test_elo_probability_uses_pre_game_values(self):
+    def test_elo_probability_uses_pre_game_values(self, predictions_source):
         """
         Verify that when calling get_elo_win_probability,
         we're using pre-game values not post-game values.
         """
-        with open(
-            "/Users/michaelstrong/2x2x2-nba-predictive-model/scripts/generate_game_predictions.py",
-            "r",
-        ) as f:
-            content = f.read()
+        content = predictions_source
 
         # Find the section where ELO probability is calculated
-        elo_section = content[content.find("# ELO probability") : content.find(
-            "# Blended probability"
-        )]
+        start = content.find("# ELO probability")
+        end = content.find("# Blended probability")
 
-        # Should use pre_game_elo variables
-        assert "pre_game_elo_home" in elo_section
-        assert "pre_game_elo_away" in elo_section
-
-        # Should NOT directly use home_stats.elo_rating or away_stats.elo_rating
+        # Should call get_elo_win_probability with the pre_game_elo variables,
+        # not home_stats.elo_rating or away_stats.elo_rating directly
         # (or if it does, should be a fallback only)
-        assert "get_elo_win_probability(" in elo_section
+        missing = ELO_SECTION_REQUIRED - find_snippets(ELO_SECTION_PATTERN, content, start, end)
+        assert not missing, f"ELO probability section is missing {sorted(missing)}"
 
+    @pytest.mark.unit
     @pytest.mark.critical
     def test_double_prediction_consistency(self):
         """
@@ -149,76 +176,26 @@ class TestELOLeakageFixCore:
         the ELO-based probabilities should be identical
         (not influenced by when the prediction is run).
         """
-        from generate_game_predictions import get_elo_win_probability
-
         # Simulate two prediction runs for the same game
         # Run 1: Nov 22, 9:00 AM
         # Run 2: Nov 22, 11:00 PM (after game played)
 
-        # Both should use the same PRE-GAME ELO
-        pre_game_lakers = 1500.0
-        pre_game_warriors = 1500.0
-
-        run1_prob = get_elo_win_probability(
-            home_elo=pre_game_lakers,
-            away_elo=pre_game_warriors,
-        )
-
-        # Even though warriors won and ELO changed
-        post_game_warriors = 1530.0  # Warriors won
-        post_game_lakers = 1470.0
-
-        # Run 2 should still use PRE-GAME ELO, not post-game
-        # (This is what get_pre_game_elo ensures)
-        run2_prob = get_elo_win_probability(
-            home_elo=pre_game_lakers,  # Still using pre-game
-            away_elo=pre_game_warriors,  # Still using pre-game
-        )
-
-        # Probabilities should be identical across runs
-        assert run1_prob == run2_prob
-
-        # If we incorrectly used post-game ELO
-        wrong_prob = get_elo_win_probability(
-            home_elo=post_game_lakers,
-            away_elo=post_game_warriors,
-        )
-
-        # This would be different (the leakage)
-        assert wrong_prob != run2_prob
+        # Both runs use the same PRE-GAME ELO (this is what get_pre_game_elo
+        # ensures), so both get PRE_GAME_PROB: even teams, a coin flip
+        assert PRE_GAME_PROB == pytest.approx(0.5)
 
+        # If run 2 incorrectly used post-game ELO, the result would differ
+        assert POST_GAME_PROB != pytest.approx(PRE_GAME_PROB)
 
 class TestELOLeakageWithFixtures:
     """Test ELO leakage prevention using standard fixtures."""
 
-    @pytest.mark.critical
-    def test_all_critical_tests_passing(self):
-        """Verify that all critical data leakage tests pass."""
-        # Run pytest on critical tests
-        import subprocess
-
-        result = subprocess.run(
-            ["python", "-m", "pytest", "tests/test_features.py", "-m", "critical", "-v"],
-            cwd="/Users/michaelstrong/2x2x2-nba-predictive-model",
-            capture_output=True,
-            text=True,
-        )
-
-        # Should have all critical tests passing
-        assert "PASSED" in result.stdout
-        # Should not have failures
-        assert "FAILED" not in result.stdout
-
-    def test_walk_forward_prevents_leakage(self):
+    def test_walk_forward_prevents_leakage(self, metrics_source):
         """
         Verify that metrics are calculated in walk-forward manner,
         preventing data leakage even before the ELO fix.
         """
-        with open(
-            "/Users/michaelstrong/2x2x2-nba-predictive-model/src/nba_2x2x2/data/metrics.py",
-            "r",
-        ) as f:
-            content = f.read()
+        content = metrics_source
 
         # Should have walk-forward order
         assert ".order_by(Game.game_date" in content
@@ -226,18 +203,14 @@ class TestELOLeakageWithFixtures:
         # Should only use prior games
         assert "Game.game_date < game_date" in content
 
-    def test_feature_engineering_uses_pre_game_elo(self):
+    def test_feature_engineering_uses_pre_game_elo(self, features_source):
         """
         Verify that feature engineering explicitly uses pre-game ELO.
 
         This was working correctly, proving the architecture supports it.
         Now the ELO probability calculation does the same.
         """
-        with open(
-            "/Users/michaelstrong/2x2x2-nba-predictive-model/src/nba_2x2x2/ml/features.py",
-            "r",
-        ) as f:
-            content = f.read()
+        content = features_source
 
         # Should have _get_pre_game_elo method
         assert "def _get_pre_game_elo" in content
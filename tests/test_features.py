@@ -6,12 +6,20 @@ Tests feature extraction, data leakage prevention, and feature consistency.
 import pytest
 import numpy as np
 import pandas as pd
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 
-from nba_2x2x2.ml.features import FeatureEngineer
+from nba_2x2x2.data.metrics import MetricsCalculator
+from nba_2x2x2.ml.features import FeatureEngineer, _validate_feature_layout
 from nba_2x2x2.data.models import Game, Team, TeamGameStats
 
 
+def assert_all_between(values: np.ndarray, low: float, high: float) -> None:
+    """Assert every value in values is within [low, high]; NaN (missing) values are skipped."""
+    bad = np.flatnonzero((values < low) | (values > high))
+    assert bad.size == 0, f"rows {bad.tolist()} outside [{low}, {high}]: {values[bad]}"
+
+
 class TestFeatureEngineerInitialization:
     """Test FeatureEngineer initialization."""
 
@@ -38,84 +46,75 @@ class TestFeatureCount:
     """Test that correct number of features are extracted."""
 
     @pytest.mark.unit
-    def test_feature_count_correct(self):
-        """Verify exactly 38 features are defined."""
+    def test_feature_layout_validated_at_import(self):
+        """Verify exactly 38 features pass the layout check run when features.py is imported."""
+        _validate_feature_layout()  # Raises ValueError on a bad layout
         # 16 home team features + 16 away team features + 6 interaction features = 38
-        expected_features = 16 + 16 + 6
-        assert len(FeatureEngineer.FEATURE_COLUMNS) == expected_features
+        assert len(FeatureEngineer.FEATURE_COLUMNS) == 16 + 16 + 6
 
     @pytest.mark.unit
-    def test_home_team_features_present(self):
-        """Verify all home team features are defined."""
-        home_features = [col for col in FeatureEngineer.FEATURE_COLUMNS if col.startswith("home_")]
-        assert len(home_features) == 16
-        assert "home_elo" in home_features
-        assert "home_ppf" in home_features
-        assert "home_ppa" in home_features
-        assert "home_back_to_back" in home_features
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            pytest.param(FeatureEngineer.FEATURE_COLUMNS + ["elo_diff"], id="duplicate"),
+            pytest.param(FeatureEngineer.FEATURE_COLUMNS[1:], id="missing"),
+            pytest.param(FeatureEngineer.FEATURE_COLUMNS[::-1], id="reordered"),
+        ],
+    )
+    def test_feature_layout_rejects_bad_columns(self, monkeypatch, columns):
+        """Verify the import-time check rejects duplicated, missing or reordered columns."""
+        monkeypatch.setattr(FeatureEngineer, "FEATURE_COLUMNS", columns)
+        with pytest.raises(ValueError, match="Invalid feature layout"):
+            _validate_feature_layout()
 
     @pytest.mark.unit
-    def test_away_team_features_present(self):
-        """Verify all away team features are defined."""
-        away_features = [col for col in FeatureEngineer.FEATURE_COLUMNS if col.startswith("away_")]
-        assert len(away_features) == 16
-        assert "away_elo" in away_features
-        assert "away_ppf" in away_features
-        assert "away_ppa" in away_features
-        assert "away_back_to_back" in away_features
-
-    @pytest.mark.unit
-    def test_interaction_features_present(self):
-        """Verify interaction features are defined."""
-        # Features that don't start with home_ or away_
-        interaction_features = [
-            col for col in FeatureEngineer.FEATURE_COLUMNS
-            if not col.startswith("home_") and not col.startswith("away_")
-        ]
-        assert len(interaction_features) == 6
-        assert "elo_diff" in interaction_features
-        assert "ppf_diff" in interaction_features
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "home_elo", "home_ppf", "home_ppa", "home_back_to_back",
+            "away_elo", "away_ppf", "away_ppa", "away_back_to_back",
+            "elo_diff", "ppf_diff", "ppa_diff",
+            "diff_5game_diff", "diff_10game_diff", "diff_20game_diff",
+        ],
+    )
+    def test_required_feature_present(self, name):
+        """Verify a required home, away or interaction feature is defined."""
+        assert name in FeatureEngineer.FEATURE_COLUMNS
 
 
 class TestFeatureScaling:
     """Test that features are in reasonable ranges."""
 
     @pytest.mark.unit
-    def test_elo_features_in_reasonable_range(self, sample_team_game_stats):
+    def test_elo_features_in_reasonable_range(self, sample_stats_columns):
         """
         Verify ELO features would be in range [1200, 1800].
         """
-        for stats in sample_team_game_stats:
-            # If we had extract_features working, ELO would be in this range
-            assert 1200 <= stats.elo_rating <= 1800
+        # If we had extract_features working, ELO would be in this range
+        assert_all_between(sample_stats_columns["elo_rating"], 1200, 1800)
 
     @pytest.mark.unit
-    def test_ppf_features_positive(self, sample_team_game_stats):
+    def test_ppf_features_positive(self, sample_stats_columns):
         """Verify PPF (points for) is always positive."""
-        for stats in sample_team_game_stats:
-            assert stats.points_for > 0
+        points_for = sample_stats_columns["points_for"]
+        assert np.all(points_for > 0), points_for
 
     @pytest.mark.unit
-    def test_ppa_features_positive(self, sample_team_game_stats):
+    def test_ppa_features_positive(self, sample_stats_columns):
         """Verify PPA (points against) is always positive."""
-        for stats in sample_team_game_stats:
-            assert stats.points_against > 0
+        points_against = sample_stats_columns["points_against"]
+        assert np.all(points_against > 0), points_against
 
     @pytest.mark.unit
-    def test_win_percentage_in_01_range(self, sample_team_game_stats):
+    def test_win_percentage_in_01_range(self, sample_stats_columns):
         """Verify win percentage is in [0, 1]."""
-        for stats in sample_team_game_stats:
-            if stats.win_pct is not None:
-                assert 0 <= stats.win_pct <= 1
+        assert_all_between(sample_stats_columns["win_pct"], 0, 1)
 
     @pytest.mark.unit
-    def test_rolling_averages_reasonable(self, sample_team_game_stats):
+    def test_rolling_averages_reasonable(self, sample_stats_columns):
         """Verify rolling averages are in reasonable ranges (points between 50 and 150)."""
-        for stats in sample_team_game_stats:
-            for field in ["ppf_5game", "ppa_5game", "ppf_10game", "ppa_10game"]:
-                val = getattr(stats, field)
-                if val is not None:
-                    assert 50 <= val <= 150
+        for field in ["ppf_5game", "ppa_5game", "ppf_10game", "ppa_10game"]:
+            assert_all_between(sample_stats_columns[field], 50, 150)
 
 
 class TestNoFutureDataLeakage:
@@ -123,7 +122,7 @@ class TestNoFutureDataLeakage:
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_no_future_data_leakage_elo(self, sample_games, sample_team_game_stats):
+    def test_no_future_data_leakage_elo(self, sample_stats_snapshot):
         """
         CRITICAL: Verify ELO ratings come from BEFORE the game.
         If stats.game_won is set (post-game info), ELO would have been updated.
@@ -131,21 +130,21 @@ class TestNoFutureDataLeakage:
         """
         # This is a structural test - the fixture doesn't actually run the walk-forward
         # So we can't verify the actual calculation, but we can verify the fields exist
-        for stats in sample_team_game_stats:
+        for stats in sample_stats_snapshot:
             assert hasattr(stats, "elo_rating")
             # ELO should be pre-game value (not updated yet)
             assert 1200 <= stats.elo_rating <= 1800
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_no_future_data_leakage_stats(self, sample_team_game_stats):
+    def test_no_future_data_leakage_stats(self, sample_stats_snapshot):
         """
         CRITICAL: Verify stats are calculated before game (rolling avgs should not include this game).
         """
         # games_played counts games BEFORE this one
         # win_pct is from games BEFORE this one
         # game_won should NOT have been used yet
-        for stats in sample_team_game_stats:
+        for stats in sample_stats_snapshot:
             # stats.games_played is the count before this game
             assert stats.games_played >= 0
             # If they played some games, they should have a win_pct
@@ -153,13 +152,13 @@ class TestNoFutureDataLeakage:
                 assert stats.win_pct is not None
 
     @pytest.mark.unit
-    def test_rolling_averages_use_only_past_games(self, sample_team_game_stats):
+    def test_rolling_averages_use_only_past_games(self, sample_stats_snapshot):
         """
         Verify rolling averages only include games BEFORE target game.
         """
         # games_played < 5: 5-game rolling average might be NULL or be based on fewer games
         # But it should NEVER include the current game's outcome
-        for stats in sample_team_game_stats:
+        for stats in sample_stats_snapshot:
             # ppf_5game should be average of <= 5 games BEFORE this one
             # Not affected by this game's result
             assert True  # Structural test - actual calculation validated in integration tests
@@ -169,7 +168,7 @@ class TestNullFeatureHandling:
     """Test handling of None values in features."""
 
     @pytest.mark.unit
-    def test_early_season_rolling_averages_can_be_null(self, sample_team_game_stats):
+    def test_early_season_rolling_averages_can_be_null(self, sample_stats_snapshot):
         """
         Verify that early-season games can have NULL rolling averages.
         Game 1 should have NULL for 5, 10, 20-game rolling averages.
@@ -185,7 +184,7 @@ class TestNullFeatureHandling:
         pass
 
     @pytest.mark.unit
-    def test_none_values_replaced_with_default(self, sample_team_game_stats):
+    def test_none_values_replaced_with_default(self, sample_stats_snapshot):
         """
         Verify None values are handled consistently.
         Either with default values or marked for special handling.
@@ -219,14 +218,6 @@ class TestInteractionFeatures:
         expected_diff = home_ppf - away_ppf
         assert expected_diff == pytest.approx(6.4, abs=0.1)
 
-    @pytest.mark.unit
-    def test_all_interaction_features_defined(self):
-        """Verify all interaction features are in columns list."""
-        interactions = ["elo_diff", "ppf_diff", "ppa_diff", "diff_5game_diff",
-                       "diff_10game_diff", "diff_20game_diff"]
-        for interaction in interactions:
-            assert interaction in FeatureEngineer.FEATURE_COLUMNS
-
 
 class TestFeatureConsistency:
     """Test that features are consistent across calls."""
@@ -243,16 +234,38 @@ class TestFeatureConsistency:
         assert engineer is not None
 
     @pytest.mark.unit
-    def test_feature_column_order_consistent(self):
-        """Verify feature column order is consistent across calls."""
-        engineer1 = FeatureEngineer  # Just check static list
-        engineer2 = FeatureEngineer
-        assert engineer1.FEATURE_COLUMNS == engineer2.FEATURE_COLUMNS
+    def test_build_dataset_matches_single_game_extraction(
+        self, test_db_session: Session, sample_teams
+    ):
+        """Verify bulk-loaded features equal per-game extract_features output."""
+        team_ids = [t.id for t in sample_teams]
+        games = []
+        for i in range(9):
+            game_date = date(2024, 1, 1) + timedelta(days=i)
+            games.append(
+                Game(
+                    id=700 + i,
+                    home_team_id=team_ids[i % 3],
+                    away_team_id=team_ids[(i + 2) % 3],
+                    home_team_score=100 + (i * 7) % 15,
+                    away_team_score=99 + (i * 3) % 11,
+                    game_date=game_date,
+                    game_datetime=datetime.combine(game_date, datetime.min.time()),
+                    season=2024 if i < 5 else 2025,
+                    status="Final",
+                )
+            )
+        test_db_session.add_all(games)
+        test_db_session.commit()
+        MetricsCalculator(test_db_session).calculate_all_metrics()
 
-    @pytest.mark.unit
-    def test_feature_names_no_duplicates(self):
-        """Verify no duplicate feature names."""
-        assert len(FeatureEngineer.FEATURE_COLUMNS) == len(set(FeatureEngineer.FEATURE_COLUMNS))
+        engineer = FeatureEngineer(test_db_session)
+        X, y, dates = engineer.build_dataset(min_season=2025, max_season=2025)
+
+        expected = [engineer.extract_features_dict(g) for g in games if g.season == 2025]
+        assert len(X) == len(expected) == 4
+        for row, features in zip(X.to_dict("records"), expected):
+            assert row == features
 
 
 class TestEarlySeasonHandling:
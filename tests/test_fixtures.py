@@ -4,6 +4,7 @@ This validates the test infrastructure setup.
 """
 
 import pytest
+from sqlalchemy import event, func
 from sqlalchemy.orm import Session
 from nba_2x2x2.data.models import Team, Game, TeamGameStats, GamePrediction
 
@@ -21,8 +22,7 @@ class TestDatabaseFixtures:
     def test_test_db_engine_creates_tables(self, test_db_session: Session):
         """Verify all tables are created in test database."""
         # Query should work without error
-        teams = test_db_session.query(Team).all()
-        assert teams == []
+        assert test_db_session.query(func.count(Team.id)).scalar() == 0
 
     @pytest.mark.unit
     def test_sample_teams_fixture(self, sample_teams):
@@ -36,9 +36,9 @@ class TestDatabaseFixtures:
     @pytest.mark.unit
     def test_sample_teams_persisted_to_db(self, test_db_session: Session, sample_teams):
         """Verify sample teams are actually in the database."""
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 5
-        assert teams[0].abbreviation == "BOS"
+        assert test_db_session.query(func.count(Team.id)).scalar() == 5
+        first_abbreviation = test_db_session.query(Team.abbreviation).order_by(Team.id).first()
+        assert first_abbreviation == ("BOS",)
 
     @pytest.mark.unit
     def test_sample_games_fixture(self, sample_games):
@@ -51,10 +51,13 @@ class TestDatabaseFixtures:
     @pytest.mark.unit
     def test_sample_games_persisted_to_db(self, test_db_session: Session, sample_games):
         """Verify sample games are actually in the database."""
-        games = test_db_session.query(Game).all()
-        assert len(games) == 10
-        first_game = games[0]
-        assert first_game.home_team_score > first_game.away_team_score
+        assert test_db_session.query(func.count(Game.id)).scalar() == 10
+        home_score, away_score = (
+            test_db_session.query(Game.home_team_score, Game.away_team_score)
+            .order_by(Game.id)
+            .first()
+        )
+        assert home_score > away_score
 
     @pytest.mark.unit
     def test_sample_team_game_stats_fixture(self, sample_team_game_stats):
@@ -72,28 +75,17 @@ class TestDatabaseFixtures:
             assert 0 <= pred.away_win_prob <= 1
             assert abs((pred.home_win_prob + pred.away_win_prob) - 1.0) < 0.001
 
-    @pytest.mark.unit
-    def test_fixture_isolation(self, test_db_session: Session, sample_teams):
-        """
-        Verify that fixtures are isolated between tests.
-        Each test should get a fresh database with fresh fixtures.
-        """
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 5
-
     @pytest.mark.unit
     def test_cleanup_fixture_works(self, test_db_session: Session, cleanup_db, sample_teams):
         """Verify cleanup fixture can clear database."""
         # Add data
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 5
+        assert test_db_session.query(func.count(Team.id)).scalar() == 5
 
         # Call cleanup
         cleanup_db()
 
         # Verify data is cleared
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 0
+        assert test_db_session.query(func.count(Team.id)).scalar() == 0
 
     @pytest.mark.unit
     def test_config_fixture_available(self, config):
@@ -118,34 +110,103 @@ class TestFixtureRelationships:
     @pytest.mark.unit
     def test_team_game_stats_relationships(self, sample_team_game_stats, sample_games):
         """Verify stats are linked to games and teams."""
+        game_ids = {g.id for g in sample_games}
         stats = sample_team_game_stats[0]
         assert stats.game is not None
         assert stats.team is not None
-        assert stats.game_id in [g.id for g in sample_games]
+        assert stats.game_id in game_ids
 
     @pytest.mark.unit
     def test_predictions_linked_to_games(self, sample_predictions, sample_games):
         """Verify predictions are linked to games."""
-        for pred in sample_predictions:
-            assert pred.game is not None
-            game_ids = [g.id for g in sample_games]
-            assert pred.game_id in game_ids
+        game_ids = {g.id for g in sample_games}
+        assert {pred.game_id for pred in sample_predictions} <= game_ids
+        assert all(pred.game is not None for pred in sample_predictions)
+
+    @pytest.mark.unit
+    def test_fixture_relationships_load_without_queries(
+        self, test_db_session: Session, sample_team_game_stats, sample_predictions, sample_games
+    ):
+        """
+        Verify relationship access on fixture rows issues no SQL.
+        Every related team and game is already in the session's identity map,
+        so many-to-one lookups resolve there instead of lazy-loading (no N+1).
+        """
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = test_db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            for game in sample_games:
+                assert game.home_team is not None and game.away_team is not None
+            for stats in sample_team_game_stats:
+                assert stats.game is not None and stats.team is not None
+            for pred in sample_predictions:
+                assert pred.game is not None
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
 
 
 class TestDatabaseIsolation:
     """Test that database changes don't persist between tests."""
 
     @pytest.mark.unit
-    def test_first_test_isolation(self, test_db_session: Session):
-        """First test starts with clean database."""
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 0
-
-    @pytest.mark.unit
-    def test_second_test_isolation(self, test_db_session: Session):
-        """Second test also starts with clean database (no data from first test)."""
-        teams = test_db_session.query(Team).all()
-        assert len(teams) == 0
+    @pytest.mark.parametrize("_iteration", [0, 1])
+    def test_db_starts_clean(self, test_db_session: Session, _iteration):
+        """
+        Each run starts with a clean database, then commits a team.
+        The second run only passes if the first run's commit did not leak.
+        """
+        assert test_db_session.query(func.count(Team.id)).scalar() == 0
+
+        # commit() only releases the test's SAVEPOINT; the outer transaction
+        # is rolled back at teardown, so the next run must not see this team
+        test_db_session.add(
+            Team(
+                abbreviation="TST",
+                city="Test",
+                conference="EAST",
+                division="Atlantic",
+                full_name="Test Team",
+                name="Team",
+            )
+        )
+        test_db_session.commit()
+        assert test_db_session.query(func.count(Team.id)).scalar() == 1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("_iteration", [0, 1])
+    def test_db_manager_commits_do_not_leak(self, test_db_manager, _iteration):
+        """
+        Commits through test_db_manager.get_session() are rolled back too.
+        The second run only passes if the first run's commit did not leak.
+        """
+        session = test_db_manager.get_session()
+        try:
+            assert session.query(func.count(Team.id)).scalar() == 0
+
+            session.add(
+                Team(
+                    abbreviation="MGR",
+                    city="Manager",
+                    conference="WEST",
+                    division="Pacific",
+                    full_name="Manager Team",
+                    name="Team",
+                )
+            )
+            session.commit()
+        finally:
+            session.close()
+
+        # A second session sees the committed row within the same test
+        with test_db_manager.get_session() as other:
+            assert other.query(func.count(Team.id)).scalar() == 1
 
 
 if __name__ == "__main__":
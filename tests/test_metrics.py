@@ -4,11 +4,19 @@ Tests walk-forward metrics calculation, ELO, rolling averages, and data leakage
 """
 
 import pytest
-from datetime import date, timedelta
+import numpy as np
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from nba_2x2x2.data.models import Game, Team, TeamGameStats
-from nba_2x2x2.data.metrics import MetricsCalculator
+from nba_2x2x2.data.metrics import MetricsCalculator, _elo_pass
+
+
+def assert_no_rows(mask: np.ndarray, problem: str) -> None:
+    """Assert no row is flagged in mask, naming the offending rows otherwise."""
+    bad = np.flatnonzero(mask)
+    assert bad.size == 0, f"rows {bad.tolist()} {problem}"
 
 
 class TestEloInitialization:
@@ -44,6 +52,26 @@ class TestEloCalculation:
         assert MetricsCalculator.ELO_INITIAL > 1000
         assert MetricsCalculator.ELO_INITIAL < 2000
 
+    @pytest.mark.unit
+    def test_elo_pass_matches_single_game_formula(self):
+        """Verify the batch ELO pass agrees with per-game _calculate_elo updates."""
+        calc = MetricsCalculator(None)
+        home_idx = np.array([0, 1, 2, 0])
+        away_idx = np.array([1, 2, 0, 2])
+        home_won = np.array([1, 0, 1, 0])
+
+        post_home, post_away = _elo_pass(
+            home_idx, away_idx, home_won, np.full(3, calc.ELO_INITIAL), float(calc.ELO_K)
+        )
+
+        elo = [calc.ELO_INITIAL] * 3
+        for i in range(len(home_idx)):
+            h, a = elo[home_idx[i]], elo[away_idx[i]]
+            elo[home_idx[i]] = calc._calculate_elo(h, a, home_won[i])
+            elo[away_idx[i]] = calc._calculate_elo(a, h, 1 - home_won[i])
+            assert post_home[i] == pytest.approx(elo[home_idx[i]])
+            assert post_away[i] == pytest.approx(elo[away_idx[i]])
+
     @pytest.mark.unit
     def test_team_game_stats_elo_field_exists(self, sample_team_game_stats):
         """Verify TeamGameStats has ELO rating field."""
@@ -53,10 +81,11 @@ class TestEloCalculation:
         assert isinstance(stats.elo_rating, float)
 
     @pytest.mark.unit
-    def test_elo_ratings_in_expected_range(self, sample_team_game_stats):
+    def test_elo_ratings_in_expected_range(self, sample_stats_columns):
         """Verify ELO ratings are in reasonable range (1200-1800)."""
-        for stats in sample_team_game_stats:
-            assert 1200 <= stats.elo_rating <= 1800
+        elo = sample_stats_columns["elo_rating"]
+        # Written as a negated range check so missing (NaN) ratings fail too
+        assert_no_rows(~((elo >= 1200) & (elo <= 1800)), "have ELO outside [1200, 1800]")
 
 
 class TestWalkForwardValidation:
@@ -64,9 +93,7 @@ class TestWalkForwardValidation:
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_walk_forward_uses_only_past_games(
-        self, test_db_session: Session, sample_games, sample_team_game_stats
-    ):
+    def test_walk_forward_uses_only_past_games(self, sample_games, sample_stats_by_game):
         """
         CRITICAL: Verify metrics calculation only uses games BEFORE target game.
         This prevents future data leakage in the model.
@@ -76,20 +103,16 @@ class TestWalkForwardValidation:
         first_game_date = first_game.game_date
 
         # Check stats for this game
-        home_stats = (
-            test_db_session.query(TeamGameStats)
-            .filter_by(game_id=first_game.id, team_id=first_game.home_team_id)
-            .first()
-        )
+        home_stats = sample_stats_by_game[first_game.id][1]
 
-        assert home_stats is not None
+        assert home_stats.team_id == first_game.home_team_id
         # Verify games_played is from BEFORE this game (not including it)
         # In this fixture, all games are within 10 days, so games_played should be <= number of days
         assert home_stats.games_played >= 0
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_metrics_calculated_chronologically(self, sample_games, sample_team_game_stats):
+    def test_metrics_calculated_chronologically(self, sample_games, sample_stats_by_game):
         """
         Verify metrics are calculated in chronological order.
         Earlier games should have fewer games_played stats.
@@ -97,9 +120,7 @@ class TestWalkForwardValidation:
         games_by_date = sorted(sample_games, key=lambda g: g.game_date)
 
         for i, game in enumerate(games_by_date[:3]):  # Check first 3 games
-            home_stats = next(
-                s for s in sample_team_game_stats if s.game_id == game.id and s.is_home == 1
-            )
+            home_stats = sample_stats_by_game[game.id][1]
             # Should not be 0 after first game (fixture sets it)
             assert home_stats.games_played >= 0
 
@@ -107,30 +128,6 @@ class TestWalkForwardValidation:
 class TestRollingAverageCalculation:
     """Test rolling average calculations."""
 
-    @pytest.mark.unit
-    def test_rolling_average_5_game_field_exists(self, sample_team_game_stats):
-        """Verify 5-game rolling average fields exist."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "ppf_5game")
-        assert hasattr(stats, "ppa_5game")
-        assert hasattr(stats, "diff_5game")
-
-    @pytest.mark.unit
-    def test_rolling_average_10_game_field_exists(self, sample_team_game_stats):
-        """Verify 10-game rolling average fields exist."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "ppf_10game")
-        assert hasattr(stats, "ppa_10game")
-        assert hasattr(stats, "diff_10game")
-
-    @pytest.mark.unit
-    def test_rolling_average_20_game_field_exists(self, sample_team_game_stats):
-        """Verify 20-game rolling average fields exist."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "ppf_20game")
-        assert hasattr(stats, "ppa_20game")
-        assert hasattr(stats, "diff_20game")
-
     @pytest.mark.unit
     def test_rolling_averages_are_numeric(self, sample_team_game_stats):
         """Verify rolling averages are numeric or None."""
@@ -140,121 +137,105 @@ class TestRollingAverageCalculation:
             assert val is None or isinstance(val, (int, float))
 
     @pytest.mark.unit
-    def test_point_differential_equals_ppf_minus_ppa(self, sample_team_game_stats):
+    def test_window_average_uses_last_n_values(self):
+        """Verify prefix-sum window average matches a plain slice average."""
+        values = [100, 110, 95, 120, 105, 99, 112]
+        cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+
+        assert MetricsCalculator._window_average(cumsum, 5) == pytest.approx(sum(values[-5:]) / 5)
+        # Window longer than history averages everything available
+        assert MetricsCalculator._window_average(cumsum, 20) == pytest.approx(sum(values) / len(values))
+        # No prior games -> no rolling average
+        assert MetricsCalculator._window_average(np.zeros(1), 5) is None
+
+    @pytest.mark.unit
+    def test_point_differential_equals_ppf_minus_ppa(self, sample_stats_columns):
         """
-        Verify point differential = PPF - PPA (within rounding).
+        Verify point differential = PPF - PPA (within rounding) for every row.
         """
-        stats = sample_team_game_stats[0]
-        # Check approximate equality (allow for floating point errors)
-        if stats.points_for and stats.points_against:
-            calculated_diff = stats.points_for - stats.points_against
-            assert abs(stats.point_differential - calculated_diff) < 0.1
+        calculated_diff = sample_stats_columns["points_for"] - sample_stats_columns["points_against"]
+        # Rows missing either points value have a NaN difference and are skipped
+        has_points = ~np.isnan(calculated_diff)
+        assert np.allclose(
+            sample_stats_columns["point_differential"][has_points],
+            calculated_diff[has_points],
+            rtol=0,
+            atol=0.1,
+        )
 
 
 class TestRestDaysCalculation:
     """Test rest days and back-to-back detection."""
 
     @pytest.mark.unit
-    def test_days_rest_field_exists(self, sample_team_game_stats):
-        """Verify days_rest field exists."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "days_rest")
-
-    @pytest.mark.unit
-    def test_back_to_back_field_exists(self, sample_team_game_stats):
-        """Verify back_to_back field exists."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "back_to_back")
-
-    @pytest.mark.unit
-    def test_days_rest_is_non_negative(self, sample_team_game_stats):
+    def test_days_rest_is_non_negative(self, sample_stats_columns):
         """Verify days_rest is >= 0."""
-        for stats in sample_team_game_stats:
-            assert stats.days_rest is None or stats.days_rest >= 0
+        assert_no_rows(sample_stats_columns["days_rest"] < 0, "have negative days_rest")
 
     @pytest.mark.unit
-    def test_back_to_back_is_boolean(self, sample_team_game_stats):
+    def test_back_to_back_is_boolean(self, sample_stats_columns):
         """Verify back_to_back is 0 or 1."""
-        for stats in sample_team_game_stats:
-            assert stats.back_to_back in [0, 1]
+        assert_no_rows(~np.isin(sample_stats_columns["back_to_back"], (0, 1)), "have back_to_back not 0/1")
 
     @pytest.mark.unit
-    def test_back_to_back_detection_accuracy(self, sample_team_game_stats):
+    def test_back_to_back_detection_accuracy(self, sample_stats_columns):
         """
         Verify back-to-back detection is accurate.
         If days_rest == 0, should be back_to_back == 1.
         """
-        for stats in sample_team_game_stats:
-            if stats.days_rest == 0:
-                assert stats.back_to_back == 1
+        days_rest = sample_stats_columns["days_rest"]
+        back_to_back = sample_stats_columns["back_to_back"]
+        assert_no_rows((days_rest == 0) & (back_to_back != 1), "have no rest but aren't back-to-back")
 
 
 class TestMetricsFields:
     """Test that all required metrics fields are present."""
 
     @pytest.mark.unit
-    def test_aggregate_statistics_fields(self, sample_team_game_stats):
-        """Verify aggregate statistics fields exist."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "games_played")
-        assert hasattr(stats, "wins")
-        assert hasattr(stats, "losses")
-        assert hasattr(stats, "win_pct")
-
-    @pytest.mark.unit
-    def test_points_fields(self, sample_team_game_stats):
-        """Verify points-related fields exist."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "points_for")
-        assert hasattr(stats, "points_against")
-        assert hasattr(stats, "point_differential")
+    @pytest.mark.parametrize("field", [
+        "games_played", "wins", "losses", "win_pct",
+        "points_for", "points_against", "point_differential",
+        "ppf_5game", "ppa_5game", "diff_5game",
+        "ppf_10game", "ppa_10game", "diff_10game",
+        "ppf_20game", "ppa_20game", "diff_20game",
+        "elo_rating", "days_rest", "back_to_back", "game_won",
+    ])
+    def test_stats_field_exists(self, field):
+        """Verify TeamGameStats maps every metrics field."""
+        assert hasattr(TeamGameStats, field)
 
     @pytest.mark.unit
-    def test_wins_losses_consistency(self, sample_team_game_stats):
+    def test_wins_losses_consistency(self, sample_stats_snapshot):
         """Verify wins + losses = games_played (within fixture constraints)."""
-        stats = sample_team_game_stats[0]
+        stats = sample_stats_snapshot[0]
         # In fixture, games_played is set arbitrarily, so just check non-negative
         assert stats.wins >= 0
         assert stats.losses >= 0
         assert stats.games_played >= 0
 
     @pytest.mark.unit
-    def test_win_percentage_in_valid_range(self, sample_team_game_stats):
+    def test_win_percentage_in_valid_range(self, sample_stats_columns):
         """Verify win percentage is between 0 and 1."""
-        for stats in sample_team_game_stats:
-            if stats.win_pct is not None:
-                assert 0 <= stats.win_pct <= 1
+        win_pct = sample_stats_columns["win_pct"]
+        assert_no_rows((win_pct < 0) | (win_pct > 1), "have win_pct outside [0, 1]")
 
 
 class TestGameOutcome:
     """Test game outcome recording."""
 
     @pytest.mark.unit
-    def test_game_won_field_exists(self, sample_team_game_stats):
-        """Verify game_won field exists."""
-        stats = sample_team_game_stats[0]
-        assert hasattr(stats, "game_won")
-
-    @pytest.mark.unit
-    def test_game_won_is_binary(self, sample_team_game_stats):
+    def test_game_won_is_binary(self, sample_stats_columns):
         """Verify game_won is 0 or 1."""
-        for stats in sample_team_game_stats:
-            assert stats.game_won in [0, 1]
+        assert_no_rows(~np.isin(sample_stats_columns["game_won"], (0, 1)), "have game_won not 0/1")
 
     @pytest.mark.unit
-    def test_home_away_game_outcomes_opposite(
-        self, test_db_session: Session, sample_games, sample_team_game_stats
-    ):
+    def test_home_away_game_outcomes_opposite(self, sample_games, sample_stats_by_game):
         """
         Verify home and away team outcomes are opposite (one won, one lost).
         """
         for game in sample_games:
-            home_stats = next(
-                s for s in sample_team_game_stats if s.game_id == game.id and s.is_home == 1
-            )
-            away_stats = next(
-                s for s in sample_team_game_stats if s.game_id == game.id and s.is_home == 0
-            )
+            home_stats = sample_stats_by_game[game.id][1]
+            away_stats = sample_stats_by_game[game.id][0]
             # One should have won (1), other should have lost (0)
             assert home_stats.game_won + away_stats.game_won == 1
 
@@ -273,16 +254,14 @@ class TestMetricsNullHandling:
         pass
 
     @pytest.mark.unit
-    def test_points_for_never_null(self, sample_team_game_stats):
+    def test_points_for_never_null(self, sample_stats_columns):
         """Verify points_for is never NULL for final games."""
-        for stats in sample_team_game_stats:
-            assert stats.points_for is not None
+        assert_no_rows(np.isnan(sample_stats_columns["points_for"]), "have NULL points_for")
 
     @pytest.mark.unit
-    def test_points_against_never_null(self, sample_team_game_stats):
+    def test_points_against_never_null(self, sample_stats_columns):
         """Verify points_against is never NULL for final games."""
-        for stats in sample_team_game_stats:
-            assert stats.points_against is not None
+        assert_no_rows(np.isnan(sample_stats_columns["points_against"]), "have NULL points_against")
 
 
 class TestMetricsIntegration:
@@ -293,14 +272,15 @@ class TestMetricsIntegration:
         self, test_db_session: Session, sample_games, sample_team_game_stats
     ):
         """Verify metrics exist for every game and both teams."""
-        for game in sample_games:
-            # Should have exactly 2 stats records (home and away)
-            stats = (
-                test_db_session.query(TeamGameStats)
-                .filter_by(game_id=game.id)
-                .all()
-            )
-            assert len(stats) == 2
+        # One grouped count instead of a query per game
+        rows_per_game = dict(
+            test_db_session.query(TeamGameStats.game_id, func.count(TeamGameStats.id))
+            .group_by(TeamGameStats.game_id)
+            .all()
+        )
+
+        # Should have exactly 2 stats records (home and away) for every game
+        assert rows_per_game == {game.id: 2 for game in sample_games}
 
     @pytest.mark.unit
     def test_metrics_game_references_valid(self, sample_team_game_stats, sample_games):
@@ -316,6 +296,77 @@ class TestMetricsIntegration:
         for stats in sample_team_game_stats:
             assert stats.team_id in team_ids
 
+    @pytest.mark.unit
+    def test_bulk_upsert_inserts_then_updates(self, test_db_session: Session, sample_games):
+        """Verify bulk_upsert inserts new rows and rewrites existing ones by key."""
+        game = sample_games[0]
+        row = {
+            "game_id": game.id,
+            "team_id": game.home_team_id,
+            "is_home": 1,
+            "games_played": 3,
+            "wins": 2,
+            "losses": 1,
+            "elo_rating": 1510.0,
+        }
+
+        TeamGameStats.bulk_upsert(test_db_session, [row])
+        TeamGameStats.bulk_upsert(test_db_session, [dict(row, wins=3, losses=0, elo_rating=1525.0)])
+        test_db_session.expire_all()
+
+        stats = test_db_session.query(TeamGameStats).filter_by(game_id=game.id).all()
+        assert len(stats) == 1
+        assert (stats[0].wins, stats[0].losses, stats[0].elo_rating) == (3, 0, 1525.0)
+        assert stats[0].updated_at is not None
+
+    @pytest.mark.unit
+    def test_sql_metrics_match_python_metrics(self, test_db_session: Session, sample_teams):
+        """Verify the SQL window-function path produces the same rows as the Python path."""
+        team_ids = [t.id for t in sample_teams]
+        start = date(2024, 1, 1)
+        rows = []
+        for i in range(12):
+            game_date = start + timedelta(days=i + i // 3)
+            rows.append(
+                dict(
+                    id=500 + i,
+                    home_team_id=team_ids[i % 3],
+                    away_team_id=team_ids[(i + 1) % 3],
+                    home_team_score=100 + (i * 7) % 15,
+                    away_team_score=98 + (i * 5) % 13,
+                    game_date=game_date,
+                    game_datetime=datetime.combine(game_date, datetime.min.time()),
+                    season=2024,
+                    status="Final",
+                )
+            )
+        test_db_session.execute(insert(Game), rows)
+        test_db_session.commit()
+
+        columns = [
+            c.name
+            for c in TeamGameStats.__table__.columns
+            if c.name not in ("id", "created_at", "updated_at")
+        ]
+
+        def snapshot():
+            # Rows are rewritten through Core, so drop any cached instances first
+            test_db_session.expire_all()
+            return sorted(
+                tuple(getattr(row, c) for c in columns)
+                for row in test_db_session.query(TeamGameStats).all()
+            )
+
+        calculator = MetricsCalculator(test_db_session)
+        calculator.calculate_all_metrics()
+        python_rows = snapshot()
+
+        calculator.calculate_all_metrics_sql()
+        sql_rows = snapshot()
+
+        assert len(sql_rows) == 24
+        assert sql_rows == python_rows
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
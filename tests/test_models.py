@@ -6,40 +6,47 @@ Tests training, evaluation, persistence, and validation methodology.
 import pytest
 import numpy as np
 import pandas as pd
-import os
-import tempfile
 from datetime import datetime, date
+from pathlib import Path
 
+from sklearn.metrics import accuracy_score, precision_score, roc_auc_score
+
+from nba_2x2x2.config import Config
 from nba_2x2x2.ml.models import GamePredictor, LIGHTGBM_AVAILABLE
 
+requires_lightgbm = pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
+
+
+@pytest.fixture(scope="module")
+def lightgbm_params():
+    """Config's LightGBM parameters, built once for the tests that only read them."""
+    return Config.get_lightgbm_params()
+
 
 class TestGamePredictorInitialization:
     """Test GamePredictor initialization."""
 
     @pytest.mark.unit
-    def test_predictor_initializes(self):
+    def test_predictor_initializes(self, tmp_path):
         """Verify GamePredictor can be instantiated."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-            assert predictor is not None
-            assert predictor.model_dir == tmpdir
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        assert predictor is not None
+        assert predictor.model_dir == str(tmp_path)
 
     @pytest.mark.unit
-    def test_predictor_creates_model_directory(self):
+    def test_predictor_creates_model_directory(self, tmp_path):
         """Verify predictor creates model directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            model_dir = os.path.join(tmpdir, "models")
-            predictor = GamePredictor(model_dir=model_dir)
-            assert os.path.exists(model_dir)
+        model_dir = tmp_path / "models"
+        predictor = GamePredictor(model_dir=str(model_dir))
+        assert model_dir.is_dir()
 
     @pytest.mark.unit
-    def test_predictor_initializes_model_attributes(self):
+    def test_predictor_initializes_model_attributes(self, tmp_path):
         """Verify predictor initializes model attributes to None."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-            assert predictor.lgb_model is None
-            assert predictor.xgb_model is None
-            assert predictor.feature_names is None
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        assert predictor.lgb_model is None
+        assert predictor.xgb_model is None
+        assert predictor.feature_names is None
 
 
 class TestTimeBasedSplit:
@@ -47,285 +54,334 @@ class TestTimeBasedSplit:
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_time_based_split_prevents_look_ahead_bias(self):
+    def test_time_based_split_prevents_look_ahead_bias(self, split_data, tmp_path):
         """
         CRITICAL: Verify time-based split creates non-overlapping train/test sets.
         No test data should be from before training cutoff date.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-
-            # Create sample data spanning 6 months
-            X = pd.DataFrame({
-                'feature_1': np.random.randn(180),
-                'feature_2': np.random.randn(180),
-            })
-            y = pd.Series(np.random.randint(0, 2, 180))
-
-            # Create dates spanning multiple months
-            dates = pd.date_range(start='2023-01-01', periods=180, freq='D')
-
-            # Split with specific cutoffs that ensure both train and test sets are non-empty
-            X_train, X_test, y_train, y_test = predictor.time_based_split(
-                X, y, dates,
-                train_cutoff_date="2023-04-01",
-                test_cutoff_date="2023-05-01"
-            )
-
-            # Verify no overlap
-            assert len(X_train) > 0
-            assert len(X_train) + len(X_test) <= len(X)  # May have gap between cutoffs
+        predictor = GamePredictor(model_dir=str(tmp_path))
+
+        # Sample data spanning 6 months
+        X, y, dates = split_data
+
+        # Split with specific cutoffs that ensure both train and test sets are non-empty
+        X_train, X_test, y_train, y_test = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date="2023-04-01",
+            test_cutoff_date="2023-05-01"
+        )
+
+        # Verify no overlap
+        assert len(X_train) > 0
+        assert len(X_train) + len(X_test) <= len(X)  # May have gap between cutoffs
+
+        # Split frames are re-indexed, so map rows back to dates through X["day"]
+        train_dates = dates[X_train['day']].to_numpy()
+        test_dates = dates[X_test['day']].to_numpy()
+        assert train_dates.max() <= np.datetime64("2023-04-01")
+        assert test_dates.min() >= np.datetime64("2023-05-01")
 
     @pytest.mark.unit
     @pytest.mark.critical
-    def test_time_based_split_no_future_data_in_training(self):
+    def test_time_based_split_no_future_data_in_training(self, split_data, tmp_path):
         """
         CRITICAL: Verify training set only contains past data.
         All training dates should be <= training cutoff.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-
-            # Create proper DataFrame with correct indexing
-            dates_list = pd.date_range(start='2023-01-01', periods=180, freq='D')
-            X = pd.DataFrame({
-                'feature_1': np.arange(180),
-            }, index=range(180))
-            y = pd.Series(np.ones(180), index=range(180))
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        X, y, dates = split_data
 
-            X_train, X_test, y_train, y_test = predictor.time_based_split(
-                X, y, dates_list,
-                train_cutoff_date="2023-05-01",
-                test_cutoff_date="2023-06-01"
-            )
+        X_train, X_test, y_train, y_test = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date="2023-05-01",
+            test_cutoff_date="2023-06-01"
+        )
 
-            # Verify train set has games from before cutoff
-            assert len(X_train) > 0
+        # Verify train set has games from before cutoff
+        assert len(X_train) > 0
+        assert dates[X_train['day']].to_numpy().max() <= np.datetime64("2023-05-01")
+        assert dates[X_test['day']].to_numpy().min() >= np.datetime64("2023-06-01")
 
     @pytest.mark.unit
-    def test_time_based_split_maintains_data_integrity(self):
+    def test_time_based_split_maintains_data_integrity(self, tmp_path):
         """Verify y values remain aligned with X after split."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        predictor = GamePredictor(model_dir=str(tmp_path))
+
+        X = pd.DataFrame({'feature': np.arange(50)})
+        y = pd.Series(np.arange(50))  # Each y matches its index in X
+        dates = pd.date_range('2023-01-01', periods=50)
+
+        X_train, X_test, y_train, y_test = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date="2023-02-10",
+            test_cutoff_date="2023-02-20"
+        )
+
+        # Verify alignment - indices should match
+        assert len(X_train) == len(y_train)
+        assert len(X_test) == len(y_test)
+
+    @pytest.mark.unit
+    def test_time_based_split_handles_unsorted_dates(self, tmp_path):
+        """Verify unsorted dates split the same rows as sorted ones."""
+        predictor = GamePredictor(model_dir=str(tmp_path))
+
+        order = np.random.default_rng(0).permutation(50)
+        X = pd.DataFrame({'feature': order})
+        y = pd.Series(order)
+        dates = pd.date_range('2023-01-01', periods=50)[order]
+
+        X_train, X_test, y_train, y_test = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date="2023-02-01",
+            test_cutoff_date="2023-02-10"
+        )
+
+        # Feature value is the day offset from 2023-01-01
+        assert sorted(X_train['feature']) == list(range(32))
+        assert sorted(X_test['feature']) == list(range(40, 50))
+        assert list(y_train) == list(X_train['feature'])
 
-            X = pd.DataFrame({'feature': np.arange(50)})
-            y = pd.Series(np.arange(50))  # Each y matches its index in X
-            dates = pd.date_range('2023-01-01', periods=50)
+    @pytest.mark.unit
+    @pytest.mark.parametrize("shuffled", [False, True], ids=["sorted", "unsorted"])
+    @pytest.mark.parametrize("gap", [1, 10, 20])
+    @pytest.mark.parametrize("train_offset", [30, 60, 90, 120, 150])
+    def test_time_based_split_never_leaks_across_cutoffs(
+        self, split_data, tmp_path, train_offset, gap, shuffled
+    ):
+        """
+        Verify the leakage invariant over a grid of cutoffs, on both the sorted
+        (binary search) and unsorted (mask) paths: every training game is on or
+        before the train cutoff, every test game on or after the test cutoff,
+        and no game on either side of the gap is dropped.
+        """
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        X, y, dates = split_data
+        if shuffled:
+            order = np.random.default_rng(0).permutation(len(X))
+            X, y, dates = X.iloc[order], y.iloc[order], dates[order]
 
-            X_train, X_test, y_train, y_test = predictor.time_based_split(
-                X, y, dates,
-                train_cutoff_date="2023-02-10",
-                test_cutoff_date="2023-02-20"
-            )
+        train_cutoff = dates.min() + pd.Timedelta(days=train_offset)
+        test_cutoff = train_cutoff + pd.Timedelta(days=gap)
 
-            # Verify alignment - indices should match
-            assert len(X_train) == len(y_train)
-            assert len(X_test) == len(y_test)
+        X_train, X_test, _, _ = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date=str(train_cutoff.date()),
+            test_cutoff_date=str(test_cutoff.date())
+        )
 
+        # X["day"] is the offset from the first date in split_data
+        assert X_train['day'].max() == train_offset
+        assert X_test['day'].min() == train_offset + gap
+        assert len(X_train) == train_offset + 1
+        assert len(X_test) == len(X) - (train_offset + gap)
 
+
+@requires_lightgbm
 class TestLightGBMTraining:
     """Test LightGBM model training."""
 
     @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_lightgbm_training_succeeds(self):
+    def test_lightgbm_training_succeeds(self, synthetic_train_test, tmp_path):
         """Verify LightGBM model can be trained without error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-
-            # Create minimal training data
-            X_train = pd.DataFrame(np.random.randn(100, 5), columns=[f'f{i}' for i in range(5)])
-            y_train = pd.Series(np.random.randint(0, 2, 100))
-            X_test = pd.DataFrame(np.random.randn(20, 5), columns=[f'f{i}' for i in range(5)])
-            y_test = pd.Series(np.random.randint(0, 2, 20))
-
-            # Train model
-            results = predictor.train_lightgbm(X_train, y_train, X_test, y_test)
-
-            # Verify results dictionary has expected keys
-            if results:  # Skip if training fails
-                assert 'accuracy' in results
-                assert 'auc' in results
-                assert 'precision' in results
-                assert 'recall' in results
-                assert 'f1' in results
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        X_train, y_train, X_test, y_test = synthetic_train_test
 
-    @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_lightgbm_predictions_in_valid_range(self):
-        """Verify LightGBM predictions are probabilities [0, 1]."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        # Train model
+        results = predictor.train_lightgbm(X_train, y_train, X_test, y_test)
 
-            X_train = pd.DataFrame(np.random.randn(100, 5), columns=[f'f{i}' for i in range(5)])
-            y_train = pd.Series(np.random.randint(0, 2, 100))
-            X_test = pd.DataFrame(np.random.randn(20, 5), columns=[f'f{i}' for i in range(5)])
-            y_test = pd.Series(np.random.randint(0, 2, 20))
+        # Verify results dictionary has expected keys
+        if results:  # Skip if training fails
+            assert 'accuracy' in results
+            assert 'auc' in results
+            assert 'precision' in results
+            assert 'recall' in results
+            assert 'f1' in results
 
-            results = predictor.train_lightgbm(X_train, y_train, X_test, y_test)
+    @pytest.mark.unit
+    def test_lightgbm_predictions_in_valid_range(self, trained_predictor, synthetic_train_test):
+        """Verify LightGBM predictions are probabilities [0, 1]."""
+        predictor, results, _ = trained_predictor
+        X_test = synthetic_train_test[2]
 
-            if results and predictor.lgb_model:
-                # Get predictions
-                preds = predictor.lgb_model.predict(X_test)
-                # All predictions should be in [0, 1]
-                assert np.all(preds >= 0)
-                assert np.all(preds <= 1)
+        if results and predictor.lgb_model:
+            # Get predictions
+            preds = predictor.lgb_model.predict(X_test)
+            # All predictions should be in [0, 1]
+            assert np.all(preds >= 0)
+            assert np.all(preds <= 1)
 
     @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_lightgbm_evaluation_metrics_valid_range(self):
+    def test_lightgbm_evaluation_metrics_valid_range(self, trained_predictor):
         """Verify evaluation metrics are in valid ranges."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
-
-            X_train = pd.DataFrame(np.random.randn(100, 5), columns=[f'f{i}' for i in range(5)])
-            y_train = pd.Series(np.random.randint(0, 2, 100))
-            X_test = pd.DataFrame(np.random.randn(20, 5), columns=[f'f{i}' for i in range(5)])
-            y_test = pd.Series(np.random.randint(0, 2, 20))
+        _, results, _ = trained_predictor
 
-            results = predictor.train_lightgbm(X_train, y_train, X_test, y_test)
-
-            if results:
-                # All metrics should be in [0, 1]
-                for metric in ['accuracy', 'auc', 'precision', 'recall', 'f1']:
-                    assert 0 <= results[metric] <= 1
+        if results:
+            # All metrics should be in [0, 1]
+            for metric in ['accuracy', 'auc', 'precision', 'recall', 'f1']:
+                assert 0 <= results[metric] <= 1
 
 
+@requires_lightgbm
 class TestModelPersistence:
     """Test model saving and loading."""
 
     @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_lightgbm_model_saved_to_disk(self):
+    def test_lightgbm_model_saved_to_disk(self, trained_predictor):
         """Verify trained LightGBM model is saved to disk."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        _, _, model_dir = trained_predictor
 
-            X_train = pd.DataFrame(np.random.randn(50, 5), columns=[f'f{i}' for i in range(5)])
-            y_train = pd.Series(np.random.randint(0, 2, 50))
-            X_test = pd.DataFrame(np.random.randn(10, 5), columns=[f'f{i}' for i in range(5)])
-            y_test = pd.Series(np.random.randint(0, 2, 10))
+        # Check model file exists and isn't empty (one stat call)
+        model_path = Path(model_dir) / "lightgbm_model.txt"
+        assert model_path.stat().st_size > 0
 
-            predictor.train_lightgbm(X_train, y_train, X_test, y_test)
+    @pytest.mark.unit
+    def test_feature_names_saved_after_training(self, trained_predictor, synthetic_train_test):
+        """Verify feature names are stored after training."""
+        predictor, _, _ = trained_predictor
 
-            # Check model file exists
-            model_path = os.path.join(tmpdir, "lightgbm_model.pkl")
-            assert os.path.exists(model_path)
-            assert os.path.getsize(model_path) > 0
+        assert predictor.feature_names == list(synthetic_train_test[0].columns)
 
     @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_feature_names_saved_after_training(self):
-        """Verify feature names are stored after training."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+    def test_lightgbm_model_reloads_with_same_predictions(self, tmp_path):
+        """Verify a model loaded from disk predicts the same as the trained one."""
+        predictor = GamePredictor(model_dir=str(tmp_path))
+
+        rng = np.random.default_rng(0)
+        feature_names = [f'f{i}' for i in range(5)]
+        X_train = pd.DataFrame(rng.standard_normal((200, 5)), columns=feature_names)
+        y_train = (X_train['f0'] > 0).to_numpy(dtype=int)
+        X_test = pd.DataFrame(rng.standard_normal((40, 5)), columns=feature_names)
+        y_test = (X_test['f0'] > 0).to_numpy(dtype=int)
 
-            feature_names = ['feat_a', 'feat_b', 'feat_c']
-            X_train = pd.DataFrame(np.random.randn(50, 3), columns=feature_names)
-            y_train = pd.Series(np.random.randint(0, 2, 50))
-            X_test = pd.DataFrame(np.random.randn(10, 3), columns=feature_names)
-            y_test = pd.Series(np.random.randint(0, 2, 10))
+        predictor.train_lightgbm(X_train, y_train, X_test, y_test)
 
-            predictor.train_lightgbm(X_train, y_train, X_test, y_test)
+        loaded = GamePredictor(model_dir=str(tmp_path))
+        loaded.load_lightgbm_model()
 
-            assert predictor.feature_names == feature_names
+        assert loaded.feature_names == feature_names
+        assert np.allclose(loaded.predict(X_test), predictor.predict(X_test))
 
 
+@requires_lightgbm
 class TestPredictionConsistency:
     """Test that model predictions are deterministic."""
 
     @pytest.mark.unit
-    @pytest.mark.skipif(not LIGHTGBM_AVAILABLE, reason="LightGBM not available")
-    def test_same_input_produces_same_prediction(self):
+    def test_same_input_produces_same_prediction(self, trained_predictor, synthetic_train_test):
         """
         Verify same input features produce same prediction (deterministic).
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        predictor, _, _ = trained_predictor
+        X_test = synthetic_train_test[2]
 
-            X_train = pd.DataFrame(np.random.randn(50, 5), columns=[f'f{i}' for i in range(5)])
-            y_train = pd.Series(np.random.randint(0, 2, 50))
-            X_test = pd.DataFrame(np.random.randn(10, 5), columns=[f'f{i}' for i in range(5)])
-            y_test = pd.Series(np.random.randint(0, 2, 10))
+        if predictor.lgb_model:
+            # Make predictions twice on same data
+            pred1 = predictor.lgb_model.predict(X_test.iloc[:1])
+            pred2 = predictor.lgb_model.predict(X_test.iloc[:1])
 
-            predictor.train_lightgbm(X_train, y_train, X_test, y_test)
+            # Should be identical
+            assert np.allclose(pred1, pred2)
+
+    @pytest.mark.unit
+    def test_predict_many_matches_individual_predictions(self, trained_predictor, synthetic_train_test):
+        """Verify batched scoring returns the same per-frame predictions in order."""
+        predictor, _, _ = trained_predictor
+        X_test = synthetic_train_test[2]
 
-            if predictor.lgb_model:
-                # Make predictions twice on same data
-                pred1 = predictor.lgb_model.predict(X_test.iloc[:1])
-                pred2 = predictor.lgb_model.predict(X_test.iloc[:1])
+        batches = [X_test.iloc[:1], X_test.iloc[1:6], X_test.iloc[6:10]]
+        results = predictor.predict_many(batches)
 
-                # Should be identical
-                assert np.allclose(pred1, pred2)
+        assert [len(r) for r in results] == [1, 5, 4]
+        for batch, result in zip(batches, results):
+            assert np.allclose(result, predictor.predict(batch))
 
 
 class TestDataValidation:
     """Test input data validation."""
 
     @pytest.mark.unit
-    def test_split_with_empty_data_handled(self):
+    def test_split_with_empty_data_handled(self, tmp_path):
         """Verify splitting handles edge cases gracefully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        predictor = GamePredictor(model_dir=str(tmp_path))
 
-            X = pd.DataFrame()
-            y = pd.Series(dtype=int)
-            dates = []
+        X = pd.DataFrame()
+        y = pd.Series(dtype=int)
+        dates = []
 
-            # Should handle empty data without crashing
-            # (May produce empty train/test sets)
-            try:
-                predictor.time_based_split(X, y, dates)
-            except Exception as e:
-                pytest.fail(f"time_based_split should handle empty data: {e}")
+        # Should handle empty data without crashing
+        # (May produce empty train/test sets)
+        try:
+            predictor.time_based_split(X, y, dates)
+        except Exception as e:
+            pytest.fail(f"time_based_split should handle empty data: {e}")
 
     @pytest.mark.unit
-    def test_split_with_properly_aligned_data(self):
+    def test_split_with_properly_aligned_data(self, tmp_path):
         """Verify split works with properly aligned data."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            predictor = GamePredictor(model_dir=tmpdir)
+        predictor = GamePredictor(model_dir=str(tmp_path))
 
-            # Create properly aligned data
-            X = pd.DataFrame(np.random.randn(100, 5), index=range(100))
-            y = pd.Series(np.random.randint(0, 2, 100), index=range(100))
-            dates = pd.date_range('2023-01-01', periods=100)
+        # Create properly aligned data
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.standard_normal((100, 5)), index=range(100))
+        y = pd.Series(rng.integers(0, 2, 100), index=range(100))
+        dates = pd.date_range('2023-01-01', periods=100)
 
-            # Should work fine with aligned data
-            X_train, X_test, y_train, y_test = predictor.time_based_split(
-                X, y, dates,
-                train_cutoff_date="2023-04-10",
-                test_cutoff_date="2023-05-01"
-            )
+        # Should work fine with aligned data
+        X_train, X_test, y_train, y_test = predictor.time_based_split(
+            X, y, dates,
+            train_cutoff_date="2023-04-10",
+            test_cutoff_date="2023-05-01"
+        )
 
-            # Should have split the data
-            assert len(X_train) > 0
+        # Should have split the data
+        assert len(X_train) > 0
 
 
 class TestConfigIntegration:
     """Test integration with Config class."""
 
     @pytest.mark.unit
-    def test_lightgbm_params_from_config(self):
+    def test_lightgbm_params_from_config(self, lightgbm_params):
         """Verify LightGBM uses parameters from Config."""
-        from nba_2x2x2.config import Config
+        # Should be a dictionary
+        assert isinstance(lightgbm_params, dict)
+
+        # Should have expected keys
+        assert 'objective' in lightgbm_params
+        assert 'metric' in lightgbm_params
+        assert 'num_leaves' in lightgbm_params
+        assert 'learning_rate' in lightgbm_params
 
-        # Get params from config
+    @pytest.mark.unit
+    def test_lightgbm_gpu_params_only_when_enabled(self, monkeypatch):
+        """Verify GPU training parameters are added only when LIGHTGBM_USE_GPU is set."""
+        monkeypatch.setattr(Config, "LIGHTGBM_USE_GPU", False)
+        assert "device_type" not in Config.get_lightgbm_params()
+
+        monkeypatch.setattr(Config, "LIGHTGBM_USE_GPU", True)
         params = Config.get_lightgbm_params()
+        assert params["device_type"] == "gpu"
+        assert params["max_bin"] == Config.LIGHTGBM_GPU_MAX_BIN
 
-        # Should be a dictionary
-        assert isinstance(params, dict)
+    @pytest.mark.unit
+    @requires_lightgbm
+    def test_lightgbm_training_with_gpu_enabled_still_trains(
+        self, monkeypatch, synthetic_train_test, tmp_path
+    ):
+        """Verify training succeeds with GPU enabled, falling back to CPU when unsupported."""
+        monkeypatch.setattr(Config, "LIGHTGBM_USE_GPU", True)
+        predictor = GamePredictor(model_dir=str(tmp_path))
+        X_train, y_train, X_test, y_test = synthetic_train_test
 
-        # Should have expected keys
-        assert 'objective' in params
-        assert 'metric' in params
-        assert 'num_leaves' in params
-        assert 'learning_rate' in params
+        results = predictor.train_lightgbm(X_train, y_train, X_test, y_test)
+
+        assert results is not None
+        assert predictor.lgb_model is not None
 
     @pytest.mark.unit
     def test_config_parameters_are_numeric(self):
         """Verify Config LightGBM parameters are numeric."""
-        from nba_2x2x2.config import Config
-
         assert isinstance(Config.LIGHTGBM_NUM_BOOST_ROUND, int)
         assert isinstance(Config.LIGHTGBM_EARLY_STOPPING_ROUNDS, int)
         assert isinstance(Config.LIGHTGBM_LEARNING_RATE, float)
@@ -336,37 +392,16 @@ class TestAccuracyMetrics:
     """Test accuracy metric calculations."""
 
     @pytest.mark.unit
-    def test_accuracy_between_0_and_1(self):
-        """Verify accuracy metric is in [0, 1] range."""
-        from sklearn.metrics import accuracy_score
-
-        y_true = [0, 1, 1, 0, 1]
-        y_pred = [0, 1, 0, 0, 1]
-        accuracy = accuracy_score(y_true, y_pred)
-
-        assert 0 <= accuracy <= 1
-
-    @pytest.mark.unit
-    def test_auc_between_0_and_1(self):
-        """Verify AUC metric is in [0, 1] range."""
-        from sklearn.metrics import roc_auc_score
-
-        y_true = [0, 1, 1, 0, 1]
-        y_prob = [0.1, 0.9, 0.8, 0.2, 0.7]
-        auc = roc_auc_score(y_true, y_prob)
-
-        assert 0 <= auc <= 1
-
-    @pytest.mark.unit
-    def test_precision_between_0_and_1(self):
-        """Verify precision metric is in [0, 1] range."""
-        from sklearn.metrics import precision_score
-
+    @pytest.mark.parametrize("metric, y_scored", [
+        (accuracy_score, [0, 1, 0, 0, 1]),
+        (precision_score, [0, 1, 0, 0, 1]),
+        (roc_auc_score, [0.1, 0.9, 0.8, 0.2, 0.7]),
+    ], ids=["accuracy", "precision", "auc"])
+    def test_metric_between_0_and_1(self, metric, y_scored):
+        """Verify each evaluation metric is in [0, 1] range."""
         y_true = [0, 1, 1, 0, 1]
-        y_pred = [0, 1, 0, 0, 1]
-        precision = precision_score(y_true, y_pred)
 
-        assert 0 <= precision <= 1
+        assert 0 <= metric(y_true, y_scored) <= 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+"""
+Unit tests for the Monte Carlo season simulation.
+Tests kernel agreement, seeding, the independent-game path, and the result
+contract consumed by the projections API and scripts.
+"""
+
+import pytest
+import numpy as np
+
+from nba_2x2x2.ml.monte_carlo import (
+    run_monte_carlo_simulation,
+    _simulate_independent,
+    _simulate_njit,
+    _simulate_vectorized,
+    _team_win_probs,
+)
+
+
+def make_games(num_games: int, team_id: int = 1, home_win_prob: float = 0.6) -> list:
+    """Remaining-schedule dicts alternating team_id between home and away."""
+    games = []
+    for i in range(num_games):
+        home, away = (team_id, 2) if i % 2 == 0 else (2, team_id)
+        games.append({"home_team_id": home, "away_team_id": away, "home_win_prob": home_win_prob})
+    return games
+
+
+def reference_final_wins(team_probs, draws, current_wins, momentum=True):
+    """Plain-loop simulation of each season, mirroring the original implementation."""
+    final_wins = []
+    for sim_draws in draws:
+        sim_wins = current_wins
+        recent = []
+        for prob, draw in zip(team_probs, sim_draws):
+            boost = 0.0
+            if momentum and len(recent) >= 5:
+                recent_5_wins = sum(recent[-5:])
+                if recent_5_wins >= 4:
+                    boost = 0.02
+                elif recent_5_wins <= 1:
+                    boost = -0.02
+            won = int(draw < min(0.95, max(0.05, prob + boost)))
+            sim_wins += won
+            recent.append(won)
+        final_wins.append(sim_wins)
+    return np.array(final_wins)
+
+
+class TestSimulationKernels:
+    """Test the momentum simulation kernels against each other."""
+
+    @pytest.mark.unit
+    def test_njit_matches_vectorized(self):
+        """Verify _simulate_njit and _simulate_vectorized give identical wins for the same draws."""
+        rng = np.random.default_rng(11)
+        team_probs = rng.uniform(0.0, 1.0, size=40)
+        draws = rng.random((500, 40))
+
+        njit_wins = _simulate_njit(team_probs, draws, 12)
+        vectorized_wins = _simulate_vectorized(team_probs, draws, 12)
+
+        np.testing.assert_array_equal(njit_wins, vectorized_wins)
+
+    @pytest.mark.unit
+    def test_vectorized_matches_reference_loop(self):
+        """Verify the vectorized kernel reproduces the per-season momentum loop."""
+        rng = np.random.default_rng(5)
+        team_probs = rng.uniform(0.0, 1.0, size=25)
+        draws = rng.random((200, 25))
+
+        np.testing.assert_array_equal(
+            _simulate_vectorized(team_probs, draws, 3),
+            reference_final_wins(team_probs, draws, 3),
+        )
+
+
+class TestRunMonteCarloSimulation:
+    """Test run_monte_carlo_simulation end to end."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("enable_momentum", [True, False])
+    def test_same_seed_is_reproducible(self, enable_momentum):
+        """Verify two runs with the same seed are identical."""
+        kwargs = dict(
+            current_wins=20, current_losses=15, remaining_games=make_games(47),
+            num_simulations=2000, team_id=1, enable_momentum=enable_momentum, seed=42,
+        )
+        assert run_monte_carlo_simulation(**kwargs) == run_monte_carlo_simulation(**kwargs)
+
+    @pytest.mark.unit
+    def test_independent_mean_matches_reference_loop(self):
+        """Verify the binomial path's mean wins is close to the momentum-free loop."""
+        games = make_games(40, home_win_prob=0.7)
+        team_probs = _team_win_probs(games, 1)
+        num_simulations = 20000
+
+        result = run_monte_carlo_simulation(
+            10, 5, games, num_simulations=num_simulations, team_id=1,
+            enable_momentum=False, seed=1,
+        )
+        draws = np.random.default_rng(2).random((num_simulations, len(team_probs)))
+        reference_mean = reference_final_wins(team_probs, draws, 10, momentum=False).mean()
+
+        # Two independent estimates of a mean with std ~3 wins: 0.15 is > 5 standard errors
+        assert result.mean_wins == pytest.approx(reference_mean, abs=0.15)
+        assert result.mean_wins == pytest.approx(10 + team_probs.sum(), abs=0.15)
+
+    @pytest.mark.unit
+    def test_independent_clamps_probabilities(self):
+        """Verify the binomial path applies the same 0.05-0.95 clamp as the momentum kernels."""
+        rng = np.random.Generator(np.random.Philox(0))
+        wins = _simulate_independent(np.array([0.0, 1.0]), 0, 20000, rng)
+        # Unclamped, every season would be exactly one win
+        assert wins.min() == 0
+        assert wins.max() == 2
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("enable_momentum", [True, False])
+    def test_empty_remaining_games(self, enable_momentum):
+        """Verify an empty schedule leaves every season at the current win total."""
+        result = run_monte_carlo_simulation(
+            30, 20, [], num_simulations=100, team_id=1,
+            enable_momentum=enable_momentum, seed=0,
+        )
+        assert result.distribution == [30] * 100
+        assert result.mean_wins == 30.0
+        assert result.std_dev == 0.0
+        assert result.median_wins == result.percentile_10 == result.percentile_90 == 30
+
+
+class TestTeamWinProbs:
+    """Test per-team win probability extraction."""
+
+    @pytest.mark.unit
+    def test_away_games_flip_probability(self):
+        """Verify away games for the selected team use 1 - home_win_prob."""
+        games = [
+            {"home_team_id": 1, "away_team_id": 2, "home_win_prob": 0.7},
+            {"home_team_id": 3, "away_team_id": 1, "home_win_prob": 0.8},
+        ]
+        np.testing.assert_allclose(_team_win_probs(games, 1), [0.7, 0.2])
+
+    @pytest.mark.unit
+    def test_drops_games_without_team(self):
+        """Verify games not involving the selected team are skipped."""
+        games = [
+            {"home_team_id": 1, "away_team_id": 2, "home_win_prob": 0.7},
+            {"home_team_id": 3, "away_team_id": 4, "home_win_prob": 0.4},
+            {"home_team_id": 2, "away_team_id": 1, "home_win_prob": 0.55},
+        ]
+        np.testing.assert_allclose(_team_win_probs(games, 1), [0.7, 0.45])
+
+    @pytest.mark.unit
+    def test_no_team_uses_home_probability(self):
+        """Verify every game keeps home_win_prob when no team is selected."""
+        games = make_games(4, home_win_prob=0.65)
+        np.testing.assert_allclose(_team_win_probs(games, None), [0.65] * 4)
+
+    @pytest.mark.unit
+    def test_empty_schedule(self):
+        """Verify an empty schedule gives an empty probability array."""
+        assert _team_win_probs([], 1).shape == (0,)
+
+
+class TestSimulationResult:
+    """Test the SimulationResult contract."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("enable_momentum", [True, False])
+    def test_result_types(self, enable_momentum):
+        """Verify mean/std are floats and median/percentiles are whole win counts."""
+        result = run_monte_carlo_simulation(
+            10, 5, make_games(30), num_simulations=1000, team_id=1,
+            enable_momentum=enable_momentum, seed=7,
+        )
+        assert type(result.mean_wins) is float
+        assert type(result.std_dev) is float
+        assert type(result.median_wins) is int
+        assert type(result.percentile_10) is int
+        assert type(result.percentile_90) is int
+        assert all(type(w) is int for w in result.distribution)
+        assert result.percentile_10 <= result.median_wins <= result.percentile_90
+
+    @pytest.mark.unit
+    def test_percentiles_are_nearest_rank(self):
+        """Verify percentiles index the sorted distribution like the original loop."""
+        result = run_monte_carlo_simulation(10, 5, make_games(30), num_simulations=1001, seed=3)
+        ordered = sorted(result.distribution)
+        n = len(ordered)
+        assert result.percentile_10 == ordered[int(n * 0.10)]
+        assert result.median_wins == ordered[n // 2]
+        assert result.percentile_90 == ordered[int(n * 0.90)]